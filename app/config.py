@@ -4,10 +4,62 @@ class Settings(BaseSettings):
     gemini_api_key: str | None = None
     gemini_model: str = "gemini-2.0-flash"
     database_url: str = "sqlite:///./data/sql_app.db"
+    db_read_workers: int = 4
+    sqlite_busy_timeout_ms: int = 5000
     scraper_timeout: int = 10
     scraper_detail_timeout: int = 5
+    scraper_detail_max_bytes: int = 524288
     scraper_max_results: int = 5
+    scraper_deep_max_pages: int = 10
+    scraper_deep_max_items: int = 300
+    scraper_deep_page_window: int = 3
     scraper_sleep_seconds: float = 0.5
+    scraper_host_burst: int = 2
+    scraper_host_limits: dict[str, dict] = {}
+    scraper_rate_ramp_after: int = 10
+    scraper_max_retry_after: float = 60.0
+    scraper_html_parser: str = "lxml"
+    scraper_parse_executor: str = "thread"
+    scraper_parse_workers: int = 4
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
+    search_deadline_seconds: float = 45.0
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 60.0
+    http_per_host_connections: int = 6
+    http_http2: bool = False
+    http_cache_enabled: bool = True
+    http_cache_path: str = "./data/http_cache.db"
+    http_cache_max_entries: int = 5000
+    http_cache_listing_ttl: float = 600.0
+    http_cache_detail_ttl: float = 604800.0
+    url_index_capacity: int = 200000
+    url_index_error_rate: float = 0.01
+    index_rescan_window: int = 1000
+    dedupe_enabled: bool = True
+    dedupe_max_distance: int = 3
+    dedupe_title_similarity: float = 0.8
+    search_cache_ttl: float = 60.0
+    search_cache_max_entries: int = 256
+    prerank_enabled: bool = True
+    prerank_min_similarity: float = 0.05
+    vector_index_enabled: bool = True
+    vector_index_path: str = "./data/vector_index"
+    vector_index_embedder: str = "hashing"
+    vector_index_dim: int = 256
+    ai_concurrency: int = 3
+    ai_batch_size: int = 5
+    ai_batch_token_budget: int = 6000
+    ai_batch_linger_seconds: float = 0.2
+    ai_score_cache_enabled: bool = True
+    ai_score_cache_max_entries: int = 50000
+    ai_score_cache_ttl_days: int = 30
+    worker_concurrency: int = 1
+    worker_poll_seconds: float = 5.0
+    worker_lease_seconds: float = 300.0
+    worker_max_attempts: int = 3
+    worker_retry_seconds: float = 60.0
     api_title: str = "VagaHunter API"
     api_description: str = "API REST para monitoramento de vagas remotas."
     api_version: str = "1.0.0"
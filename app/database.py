@@ -1,9 +1,14 @@
+import asyncio
 import os
-from sqlalchemy import create_engine
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import MetaData, create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Callable, TypeVar
 from .config import settings
 
+T = TypeVar("T")
+
 db_url = settings.database_url
 connect_args = {"check_same_thread": False} if db_url.startswith("sqlite") else {}
 
@@ -20,9 +25,110 @@ engine = create_engine(db_url, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers proceed while a write is in progress; busy_timeout makes
+        # concurrent writers wait for the lock instead of failing with "database is locked".
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+# Async code never touches a Session on the event loop: reads run on a small pool,
+# writes on a single thread so SQLite writers queue up instead of contending.
+_executors: dict[str, ThreadPoolExecutor] = {}
+
+def _executor(kind: str) -> ThreadPoolExecutor:
+    executor = _executors.get(kind)
+    if executor is None:
+        workers = 1 if kind == "write" else settings.db_read_workers
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"db-{kind}")
+        _executors[kind] = executor
+    return executor
+
+async def run_db(fn: Callable[..., T], *args, write: bool = False) -> T:
+    """Run `fn(session, *args)` off the event loop with a session of its own.
+
+    Return plain data or schemas from `fn`; ORM objects are detached once it returns.
+    """
+    def call():
+        db = SessionLocal()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor("write" if write else "read"), call)
+
+def shutdown_executors():
+    for executor in _executors.values():
+        executor.shutdown(wait=True)
+    _executors.clear()
+
+def rescan_floor(db: Session, max_id: int) -> int:
+    """Id above which a catch-up read past `max_id` has to look again.
+
+    PostgreSQL assigns ids at insert time, so a row can commit after rows with higher
+    ids became visible; the last `index_rescan_window` ids are read again to catch it.
+    SQLite serializes writers, so its ids become visible in order.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return max_id
+    return max(0, max_id - settings.index_rescan_window)
+
+def _migrate_job_aliases():
+    """Copy a job_aliases table keyed by url into the current layout with an id column."""
+    inspector = inspect(engine)
+    if "job_aliases" not in inspector.get_table_names():
+        return
+    if "id" in {column["name"] for column in inspector.get_columns("job_aliases")}:
+        return
+    from .models.job import Job, JobAlias
+
+    metadata = MetaData()
+    Job.__table__.to_metadata(metadata)  # resolves the foreign key, is not created
+    staging = JobAlias.__table__.to_metadata(metadata, name="job_aliases_new")
+    staging.indexes.clear()  # init_db creates them under their real names after the rename
+    with engine.begin() as conn:
+        for index in inspector.get_indexes("job_aliases"):
+            conn.execute(text(f"DROP INDEX {index['name']}"))
+        staging.create(conn)
+        conn.execute(text(
+            "INSERT INTO job_aliases_new (url, job_id, created_at) "
+            "SELECT url, job_id, created_at FROM job_aliases ORDER BY created_at"
+        ))
+        conn.execute(text("DROP TABLE job_aliases"))
+        conn.execute(text("ALTER TABLE job_aliases_new RENAME TO job_aliases"))
+
+def _add_missing_columns():
+    """Add nullable columns introduced after a table was first created (there are no migrations)."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+def init_db():
+    _migrate_job_aliases()
+    Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    # create_all skips indexes on tables that already exist, so add new ones explicitly
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import json
 import pandas as pd
 from datetime import datetime
 
@@ -14,26 +15,88 @@ st.markdown("Monitoramento de vagas remotas em tempo real.")
 with st.sidebar:
     st.header("Busca")
     query = st.text_input("Tecnologia (ex: Python)", value="Python")
-    if st.button("Buscar Novas Vagas"):
-        with st.spinner(f"Buscando vagas de {query}..."):
-            try:
-                response = requests.post(f"{API_URL}/jobs/search?query={query}")
-                if response.status_code == 200:
-                    new_jobs = response.json()
-                    st.success(f"{len(new_jobs)} vagas encontradas!")
-                else:
-                    st.error("Erro na busca.")
-            except Exception as e:
-                st.error(f"Erro de conexão: {e}")
+    deep = st.checkbox("Busca profunda (várias páginas)", value=False)
+    search_clicked = st.button("Buscar Novas Vagas")
+
+    st.header("Filtros")
+    source_filter = st.selectbox("Fonte", ["Todas", "Programathor", "WeWorkRemotely", "RemoteOK"])
+    min_score = st.slider("Match mínimo", 0, 100, 0)
+    remote_only = st.checkbox("Somente remoto", value=False)
+    order = st.radio("Ordenar por", ["recent", "score"], format_func=lambda o: "Mais recentes" if o == "recent" else "Melhor match")
+
+# Progressive results: render jobs as the API streams them
+if search_clicked:
+    st.subheader(f"Resultados para {query}")
+    status = st.empty()
+    results_placeholder = st.empty()
+    streamed = {}
+    try:
+        with requests.post(f"{API_URL}/jobs/search/stream", params={"query": query, "deep": deep}, stream=True) as response:
+            if response.status_code != 200:
+                try:
+                    detail = response.json().get("detail")
+                except ValueError:
+                    detail = None
+                st.error(f"Erro na busca: {detail}" if detail else "Erro na busca.")
+            else:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if event["event"] == "job":
+                        streamed[event["job"]["url"]] = event["job"]
+                    elif event["event"] == "score" and event["url"] in streamed:
+                        streamed[event["url"]]["match_score"] = event["match_score"]
+                        streamed[event["url"]]["match_reason"] = event["match_reason"]
+                    elif event["event"] == "error":
+                        st.error(f"Erro na busca: {event.get('detail') or 'erro desconhecido'}")
+                        continue
+                    elif event["event"] == "done":
+                        status.success(f"{event['found']} vagas encontradas ({event['new']} novas, {event.get('duplicates', 0)} duplicadas)!")
+                        if event.get("pending"):
+                            st.warning(f"{event['pending']} vagas não terminaram a tempo e continuam em segundo plano.")
+                        continue
+                    status.info(f"Buscando vagas de {query}... {len(streamed)} recebidas")
+                    if not streamed:
+                        # Nothing to show yet (e.g. a `pending` event came first).
+                        continue
+                    results_placeholder.dataframe(
+                        pd.DataFrame(list(streamed.values())).reindex(
+                            columns=['title', 'company', 'source', 'match_score', 'match_reason', 'url']
+                        ),
+                        column_config={"url": st.column_config.LinkColumn("Link")},
+                        width="stretch",
+                        hide_index=True,
+                    )
+    except requests.RequestException as e:
+        st.error(f"Erro de conexão: {e}")
+    except ValueError as e:
+        st.error(f"Resposta inválida da API: {e}")
 
 # Main Content - Jobs List
 st.subheader("Vagas Cadastradas")
 
 try:
     # Fetch jobs from local API
-    response = requests.get(f"{API_URL}/jobs?limit=100")
-    if response.status_code == 200:
+    params = {"limit": 100, "order": order}
+    if source_filter != "Todas":
+        params["source"] = source_filter
+    if min_score:
+        params["min_score"] = min_score
+    if remote_only:
+        params["is_remote"] = True
+    params["fields"] = "id,title,company,source,is_remote,match_score,match_reason,url"
+    # Reruns repeat the same request: send the last ETag and reuse the rows on 304.
+    cached = st.session_state.get("jobs_cache")
+    headers = {"If-None-Match": cached["etag"]} if cached and cached["params"] == params else {}
+    response = requests.get(f"{API_URL}/jobs", params=params, headers=headers)
+    jobs = None
+    if response.status_code == 304:
+        jobs = cached["jobs"]
+    elif response.status_code == 200:
         jobs = response.json()
+        st.session_state["jobs_cache"] = {"params": params, "etag": response.headers.get("ETag"), "jobs": jobs}
+    if jobs is not None:
         
         if jobs:
             # Convert to DataFrame for easier display
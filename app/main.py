@@ -1,18 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from .database import engine, Base
-from .routers import jobs
+from fastapi.middleware.gzip import GZipMiddleware
+from .database import SessionLocal, engine, init_db, shutdown_executors
+from .routers import crawl, jobs, stats
 from .config import settings
+from .services.http_client import HttpClientPool
+from .services.http_cache import HttpCache
+from .services.url_index import KnownUrlIndex
+from .services.dedupe import NearDuplicateIndex
+from .services.prerank import LocalRanker
+from .services.search_cache import SearchCoalescer
+from .services.circuit_breaker import CircuitBreakers
+from .services.vector_index import VectorIndex
+from .services import parsing, text_search
+from .services.metrics import MetricsMiddleware
 
 # Create DB tables
-Base.metadata.create_all(bind=engine)
+init_db()
+text_search.setup(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http_pool = HttpClientPool()
+    app.state.http_cache = HttpCache() if settings.http_cache_enabled else None
+    app.state.url_index = KnownUrlIndex(SessionLocal)
+    await asyncio.to_thread(app.state.url_index.warm)
+    app.state.dedupe_index = NearDuplicateIndex() if settings.dedupe_enabled else None
+    if app.state.dedupe_index is not None:
+        await asyncio.to_thread(app.state.dedupe_index.warm, SessionLocal)
+    app.state.search_cache = SearchCoalescer()
+    app.state.breakers = CircuitBreakers()
+    app.state.ranker = LocalRanker() if settings.prerank_enabled else None
+    if app.state.ranker is not None:
+        await asyncio.to_thread(app.state.ranker.warm, SessionLocal)
+    app.state.vector_index = VectorIndex() if settings.vector_index_enabled else None
+    if app.state.vector_index is not None:
+        await asyncio.to_thread(app.state.vector_index.warm, SessionLocal)
+    try:
+        yield
+    finally:
+        await app.state.http_pool.aclose()
+        parsing.shutdown_executor()
+        shutdown_executors()
+        if app.state.http_cache is not None:
+            app.state.http_cache.close()
+        if app.state.vector_index is not None:
+            app.state.vector_index.close()
 
 app = FastAPI(
     title=settings.api_title,
     description=settings.api_description,
     version=settings.api_version,
+    lifespan=lifespan,
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(jobs.router, tags=["jobs"])
+app.include_router(crawl.router, tags=["crawl"])
+app.include_router(stats.router, tags=["stats"])
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, JSON
+from sqlalchemy.sql import func
+from ..database import Base
+
+class SavedQuery(Base):
+    """A search the worker re-runs every `interval_minutes` to keep `jobs` fresh."""
+
+    __tablename__ = "saved_queries"
+
+    id = Column(Integer, primary_key=True)
+    query = Column(String, nullable=False)
+    deep = Column(Boolean, default=False, nullable=False)
+    interval_minutes = Column(Integer, nullable=False)
+    enabled = Column(Boolean, default=True, nullable=False)
+    last_enqueued_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("ix_saved_queries_query_deep", "query", "deep", unique=True),)
+
+class CrawlTask(Base):
+    """One queued search. Workers lease a task, run it and record the job ids it produced."""
+
+    __tablename__ = "crawl_tasks"
+
+    id = Column(Integer, primary_key=True)
+    query = Column(String, nullable=False)
+    deep = Column(Boolean, default=False, nullable=False)
+    # pending -> running -> done | failed; a running task whose lease expired is claimable again.
+    status = Column(String(16), default="pending", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    run_after = Column(DateTime(timezone=True), nullable=False)
+    leased_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    saved_query_id = Column(Integer, ForeignKey("saved_queries.id", ondelete="SET NULL"), nullable=True)
+    job_ids = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Workers scan (status, run_after) for the next claimable task.
+        Index("ix_crawl_tasks_status_run_after", "status", "run_after", "id"),
+        Index("ix_crawl_tasks_query_deep_status", "query", "deep", "status"),
+    )
@@ -1,7 +1,32 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+import zlib
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 from ..database import Base
 
+class CompressedText(TypeDecorator):
+    """Text stored zlib-compressed on SQLite; other backends get plain text.
+
+    SQLite keeps BLOBs as-is in a TEXT column, so compressed values and rows written
+    before compression (plain str) coexist without a migration. PostgreSQL already
+    compresses large values itself (TOAST), so it stores the text unchanged.
+    """
+
+    impl = String
+    cache_ok = True
+    min_bytes = 256
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        data = value.encode("utf-8")
+        return zlib.compress(data, 6) if len(data) >= self.min_bytes else value
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, bytes):
+            return zlib.decompress(value).decode("utf-8")
+        return value
+
 class Job(Base):
     __tablename__ = "jobs"
 
@@ -11,7 +36,28 @@ class Job(Base):
     url = Column(String, unique=True)
     source = Column(String)
     is_remote = Column(Boolean, default=True)
-    description = Column(String, nullable=True)
+    description = Column(CompressedText, nullable=True)
     match_score = Column(Integer, nullable=True)
     match_reason = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    simhash = Column(BigInteger, nullable=True)
+
+    __table_args__ = (
+        # Keyset pagination walks (filter, id) so each page is an index range scan.
+        Index("ix_jobs_source_id", "source", "id"),
+        Index("ix_jobs_is_remote_id", "is_remote", "id"),
+        Index("ix_jobs_match_score_id", "match_score", "id"),
+        Index("ix_jobs_source_match_score_id", "source", "match_score", "id"),
+        Index("ix_jobs_created_at", "created_at"),
+    )
+
+class JobAlias(Base):
+    """Another URL for a stored job: a near-duplicate posting on another board or a repost."""
+
+    __tablename__ = "job_aliases"
+
+    # Catch-up reads of other processes' aliases use the id as a watermark, like jobs.id.
+    id = Column(Integer, primary_key=True)
+    url = Column(String, unique=True, nullable=False)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), index=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
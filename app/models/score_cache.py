@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from ..database import Base
+
+class ScoreCacheEntry(Base):
+    __tablename__ = "ai_score_cache"
+
+    key = Column(String(64), primary_key=True)
+    model = Column(String)
+    query = Column(String)
+    score = Column(Integer)
+    reason = Column(String)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
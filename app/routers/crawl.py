@@ -0,0 +1,51 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .. import schemas, database
+from ..models import crawl as models
+from ..services import task_queue
+
+router = APIRouter()
+
+@router.post("/jobs/search/tasks", response_model=schemas.CrawlTask, status_code=202)
+def enqueue_search(query: str, deep: bool = False, db: Session = Depends(database.get_db)):
+    """Queue a search for the crawl worker and return its task right away; poll
+    `GET /jobs/search/tasks/{id}` until `status` is `done` (or `failed`)."""
+    query = (query or "").strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="Query is required")
+    return task_queue.enqueue(db, query, deep)
+
+@router.get("/jobs/search/tasks/{task_id}", response_model=schemas.CrawlTask)
+def get_search_task(task_id: int, db: Session = Depends(database.get_db)):
+    task = task_queue.get_task(db, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+@router.post("/saved-queries", response_model=schemas.SavedQuery, status_code=201)
+def create_saved_query(saved: schemas.SavedQueryCreate, db: Session = Depends(database.get_db)):
+    """Have the crawl worker re-run this search every `interval_minutes`."""
+    row = models.SavedQuery(**saved.model_dump(), enabled=True)
+    db.add(row)
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Query is already saved") from e
+    db.refresh(row)
+    return row
+
+@router.get("/saved-queries", response_model=List[schemas.SavedQuery])
+def list_saved_queries(db: Session = Depends(database.get_db)):
+    return db.query(models.SavedQuery).order_by(models.SavedQuery.id).all()
+
+@router.delete("/saved-queries/{saved_query_id}", status_code=204)
+def delete_saved_query(saved_query_id: int, db: Session = Depends(database.get_db)):
+    row = db.get(models.SavedQuery, saved_query_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Saved query not found")
+    db.delete(row)
+    db.commit()
+    return Response(status_code=204)
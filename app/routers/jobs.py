@@ -1,73 +1,294 @@
-import asyncio
+import base64
+import hashlib
+import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from typing import List
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, and_, or_, type_coerce
+from sqlalchemy.orm import Session, load_only
+from typing import List, Literal, Optional
 from .. import schemas, database
 from ..models import job as models
-from ..services.scraper import JobScraper
-from ..services.ai_analyzer import analyze_job
+from ..services.scraper import JobScraper, clean_query
+from ..services.search_pipeline import SearchPipeline
+from ..services.vector_index import VectorIndex
+from ..services import text_search
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-@router.post("/jobs/search", response_model=List[schemas.Job])
-async def search_jobs(query: str, db: Session = Depends(database.get_db)):
+def get_scraper(request: Request) -> JobScraper:
+    return JobScraper(
+        http=request.app.state.http_pool,
+        cache=request.app.state.http_cache,
+        url_index=request.app.state.url_index,
+        breakers=request.app.state.breakers,
+    )
+
+def get_pipeline(request: Request, scraper: JobScraper = Depends(get_scraper)) -> SearchPipeline:
+    return SearchPipeline(
+        scraper,
+        url_index=request.app.state.url_index,
+        dedupe_index=request.app.state.dedupe_index,
+        ranker=request.app.state.ranker,
+        vector_index=request.app.state.vector_index,
+    )
+
+def _require_query(query: str) -> str:
     query = (query or "").strip()
     if not query:
         raise HTTPException(status_code=400, detail="Query is required")
+    return query
+
+@router.post("/jobs/search", response_model=List[schemas.Job])
+async def search_jobs(
+    query: str,
+    request: Request,
+    response: Response,
+    deep: bool = False,
+    pipeline: SearchPipeline = Depends(get_pipeline),
+):
+    """Scrape every source and return the matching jobs; near-duplicates of a stored
+    posting are returned as that posting instead of being stored again.
+
+    Identical searches running at the same time share one scrape, and its result is
+    reused for `SEARCH_CACHE_TTL` seconds.
+
+    The search stops after `SEARCH_DEADLINE_SECONDS`. Postings not finished by then are
+    counted in `X-Search-Pending` and handed to the crawl task named in `X-Search-Task`
+    (see `GET /jobs/search/tasks/{id}`); partial results are not cached.
+    """
+    query = _require_query(query)
+    outcome = await request.app.state.search_cache.run(
+        (clean_query(query), deep),
+        lambda: pipeline.run(query, deep),
+        cacheable=lambda outcome: not outcome.pending,
+    )
+    if outcome.pending:
+        response.headers["X-Search-Pending"] = str(len(outcome.pending))
+        if outcome.task_id is not None:
+            response.headers["X-Search-Task"] = str(outcome.task_id)
+    return outcome.jobs
+
+def _serialize(event: dict) -> dict:
+    if event["event"] == "saved":
+        return {"event": "saved", "jobs": [{"url": job.url, "id": job.id} for job in event["jobs"]]}
+    if event["event"] == "pending":
+        jobs = [job.model_dump(mode="json", include={"url", "title", "company", "source"}) for job in event["jobs"]]
+        return {**event, "jobs": jobs}
+    if "job" in event:
+        return {**event, "job": event["job"].model_dump(mode="json")}
+    return event
+
+@router.post("/jobs/search/stream")
+async def search_jobs_stream(
+    query: str,
+    deep: bool = False,
+    pipeline: SearchPipeline = Depends(get_pipeline),
+):
+    """Stream NDJSON events: `job` as each posting is scraped, `duplicate` when it is a
+    near-copy of another posting, `score` when its AI score arrives, `pending` for postings
+    left unfinished at the deadline, then `done` once the new jobs are stored."""
+    query = _require_query(query)
+
+    async def lines():
+        async for event in pipeline.events(query, deep):
+            yield json.dumps(_serialize(event), ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# List endpoints leave out `description` (up to 5,000 characters per job) unless asked.
+LIST_FIELDS = tuple(name for name in schemas.Job.model_fields if name != "description")
+FIELDS_QUERY = Query(
+    None,
+    description="Campos separados por vírgula (ex.: `id,title,url`); por padrão todos exceto `description`",
+)
+
+def _parse_fields(fields: Optional[str]) -> list[str]:
+    if not fields:
+        return list(LIST_FIELDS)
+    selected = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in selected if name not in schemas.Job.model_fields]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown) or fields}")
+    return selected
 
-    scraper = JobScraper()
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+def _list_response(
+    request: Request,
+    jobs: List[models.Job],
+    fields: list[str],
+    headers: dict | None = None,
+    similarity: dict[int, float] | None = None,
+) -> Response:
+    """Serialize the projected jobs and answer 304 when the client already has this body."""
+    payload = [{name: getattr(job, name) for name in fields} for job in jobs]
+    if similarity is not None:
+        for row, job in zip(payload, jobs):
+            row["similarity"] = round(similarity[job.id], 4)
+    body = json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    headers = {**(headers or {}), "ETag": f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"', "Cache-Control": "no-cache"}
+    if _etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+@router.get("/jobs/search-local", response_model=List[schemas.Job])
+def search_local(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Termos da busca; use `pyth*` para prefixo"),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(database.get_db),
+):
+    """Ranked full-text search over stored job titles and descriptions (no scraping)."""
+    if text_search.backend is None:
+        raise HTTPException(status_code=503, detail="Full-text search is not available on this database")
+    return _list_response(request, text_search.search(db, q, limit), _parse_fields(fields))
+
+def _vector_index(request: Request, db: Session) -> VectorIndex:
+    """The similarity index, caught up with jobs stored since the last call (e.g. by the worker)."""
+    index = request.app.state.vector_index
+    if index is None:
+        raise HTTPException(status_code=503, detail="Similarity index is disabled")
+    index.refresh(db)
+    return index
+
+def _ranked_response(request: Request, db: Session, ranked: list[tuple[int, float]], fields: list[str]) -> Response:
+    columns = dict.fromkeys([*fields, "id"])
+    rows = (
+        db.query(models.Job)
+        .options(load_only(*(getattr(models.Job, name) for name in columns)))
+        .filter(models.Job.id.in_([job_id for job_id, _ in ranked]))
+        .all()
+    )
+    by_id = {job.id: job for job in rows}
+    jobs = [by_id[job_id] for job_id, _ in ranked if job_id in by_id]
+    return _list_response(request, jobs, fields, similarity=dict(ranked))
+
+@router.get("/jobs/match", response_model=List[schemas.SimilarJob])
+def match_jobs(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Texto livre, ex.: `python django remoto júnior`"),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(database.get_db),
+):
+    """Rank the stored jobs by vector similarity to `q`, best first. Nothing is scraped
+    and Gemini is not called; `similarity` is the cosine between the two vectors."""
+    selected = _parse_fields(fields)
+    index = _vector_index(request, db)
+    return _ranked_response(request, db, index.match([q], limit)[0], selected)
+
+@router.get("/jobs/{job_id}/similar", response_model=List[schemas.SimilarJob])
+def similar_jobs(
+    job_id: int,
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(database.get_db),
+):
+    """Stored jobs most similar to job `job_id` ("more jobs like this"), best first."""
+    selected = _parse_fields(fields)
+    index = _vector_index(request, db)
+    ranked = index.similar(job_id, limit)
+    if ranked is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _ranked_response(request, db, ranked, selected)
+
+def _encode_cursor(order: str, job: models.Job) -> str:
+    key = [job.match_score, job.id] if order == "score" else [job.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def _decode_cursor(cursor: str) -> list:
     try:
-        found_jobs = await scraper.search_jobs(query)
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Scraper error: {e}")
-
-    if not found_jobs:
-        return []
-
-    urls = [job.url for job in found_jobs]
-    existing_jobs = db.query(models.Job).filter(models.Job.url.in_(urls)).all()
-    existing_map = {job.url: job for job in existing_jobs}
-    saved_jobs = list(existing_map.values())
-    new_jobs = [job_data for job_data in found_jobs if job_data.url not in existing_map]
-
-    semaphore = asyncio.Semaphore(3)
-
-    async def _score_job(job_data: schemas.JobCreate):
-        if not job_data.description:
-            job_data.match_score = 0
-            job_data.match_reason = "Descrição ausente"
-            return
-        async with semaphore:
-            try:
-                analysis = await asyncio.to_thread(analyze_job, job_data.description, query)
-            except Exception as e:
-                logger.exception("AI scoring failed for %s: %s", job_data.url, e)
-                job_data.match_score = 0
-                job_data.match_reason = "AI Error"
-                return
-        job_data.match_score = int(analysis.get("score", 0))
-        job_data.match_reason = (analysis.get("reason", "N/A") or "N/A")[:400]
-
-    await asyncio.gather(*(_score_job(job_data) for job_data in new_jobs))
-
-    if new_jobs:
-        db_jobs = [models.Job(**job_data.dict()) for job_data in new_jobs]
-        db.add_all(db_jobs)
-        try:
-            db.commit()
-        except SQLAlchemyError as e:
-            db.rollback()
-            raise HTTPException(status_code=500, detail="Database is not writable") from e
-        for db_job in db_jobs:
-            db.refresh(db_job)
-        saved_jobs.extend(db_jobs)
-
-    return saved_jobs
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+    if not isinstance(key, list) or not all(isinstance(part, int) for part in key):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+def _created_at_bound(db: Session, value: datetime):
+    """Compare `created_at` against `value` the way the column is stored.
+
+    Timestamps are naive UTC. SQLite keeps `CURRENT_TIMESTAMP` text without fractional
+    seconds and compares it as text, so the bound is written in that same form.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    if db.get_bind().dialect.name != "sqlite":
+        return models.Job.created_at, value
+    text = value.strftime("%Y-%m-%d %H:%M:%S") + (f".{value.microsecond:06d}" if value.microsecond else "")
+    return type_coerce(models.Job.created_at, String), text
 
 @router.get("/jobs", response_model=List[schemas.Job])
-def list_jobs(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
-    jobs = db.query(models.Job).offset(skip).limit(limit).all()
-    return jobs
+def list_jobs(
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    order: Literal["recent", "score"] = "recent",
+    source: Optional[str] = None,
+    is_remote: Optional[bool] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(database.get_db),
+):
+    """List stored jobs, newest first (`order=recent`) or best match first (`order=score`).
+
+    Pages are keyset-paginated: pass the `X-Next-Cursor` header of one response as
+    `cursor` to get the next page. `order=score` only lists jobs that have a score.
+    Only the requested `fields` are read and returned (`description` is opt-in), and
+    responses carry an `ETag`, so a poll with `If-None-Match` gets an empty 304.
+    """
+    selected = _parse_fields(fields)
+    # The cursor needs id and match_score even when the client did not ask for them.
+    columns = dict.fromkeys([*selected, "id", "match_score"])
+    q = db.query(models.Job).options(load_only(*(getattr(models.Job, name) for name in columns)))
+    if source is not None:
+        q = q.filter(models.Job.source == source)
+    if is_remote is not None:
+        q = q.filter(models.Job.is_remote == is_remote)
+    if min_score is not None:
+        q = q.filter(models.Job.match_score >= min_score)
+    if since is not None:
+        column, bound = _created_at_bound(db, since)
+        q = q.filter(column >= bound)
+    if until is not None:
+        column, bound = _created_at_bound(db, until)
+        q = q.filter(column < bound)
+
+    if order == "score":
+        q = q.filter(models.Job.match_score.isnot(None))
+        if cursor:
+            key = _decode_cursor(cursor)
+            if len(key) != 2:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            score, last_id = key
+            q = q.filter(or_(
+                models.Job.match_score < score,
+                and_(models.Job.match_score == score, models.Job.id < last_id),
+            ))
+        q = q.order_by(models.Job.match_score.desc(), models.Job.id.desc())
+    else:
+        # ids are assigned in insertion order, so id order is created_at order
+        if cursor:
+            key = _decode_cursor(cursor)
+            if len(key) != 1:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            q = q.filter(models.Job.id < key[0])
+        q = q.order_by(models.Job.id.desc())
+
+    if skip and not cursor:
+        q = q.offset(skip)
+    jobs = q.limit(limit).all()
+    headers = {"X-Next-Cursor": _encode_cursor(order, jobs[-1])} if len(jobs) == limit else {}
+    return _list_response(request, jobs, selected, headers)
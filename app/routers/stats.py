@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import PlainTextResponse
+from ..services import metrics
+from ..services.http_client import HttpClientPool, get_http_pool
+from ..services.ai_analyzer import score_cache
+
+router = APIRouter()
+
+@router.get("/stats/http")
+def http_stats(http: HttpClientPool = Depends(get_http_pool)):
+    return http.stats()
+
+@router.get("/stats/http-cache")
+def http_cache_stats(request: Request):
+    cache = request.app.state.http_cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+@router.get("/stats/url-index")
+def url_index_stats(request: Request):
+    return request.app.state.url_index.stats()
+
+@router.get("/stats/ai-cache")
+def ai_cache_stats():
+    if score_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **score_cache.stats()}
+
+@router.get("/stats/dedupe")
+def dedupe_stats(request: Request):
+    index = request.app.state.dedupe_index
+    if index is None:
+        return {"enabled": False}
+    return {"enabled": True, **index.stats()}
+
+@router.get("/stats/prerank")
+def prerank_stats(request: Request):
+    ranker = request.app.state.ranker
+    if ranker is None:
+        return {"enabled": False}
+    return {"enabled": True, **ranker.stats()}
+
+@router.get("/stats/search-cache")
+def search_cache_stats(request: Request):
+    return request.app.state.search_cache.stats()
+
+@router.get("/stats/circuits")
+def circuit_stats(request: Request):
+    return request.app.state.breakers.stats()
+
+@router.get("/stats/vector-index")
+def vector_index_stats(request: Request):
+    index = request.app.state.vector_index
+    if index is None:
+        return {"enabled": False}
+    return {"enabled": True, **index.stats()}
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Stage latency histograms, retry/failure and AI call/token counters in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
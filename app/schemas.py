@@ -1,5 +1,5 @@
-from pydantic import BaseModel, field_validator
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
 from datetime import datetime
 from urllib.parse import urlparse
 
@@ -44,3 +44,43 @@ class Job(JobBase):
 
     class Config:
         from_attributes = True
+
+class SimilarJob(Job):
+    similarity: float
+
+class SavedQueryCreate(BaseModel):
+    query: str
+    deep: bool = False
+    interval_minutes: int = Field(60, ge=5)
+
+    @field_validator("query")
+    @classmethod
+    def _require_query(cls, v: str) -> str:
+        text = (v or "").strip()
+        if not text:
+            raise ValueError("Query is required")
+        return text
+
+class SavedQuery(SavedQueryCreate):
+    id: int
+    enabled: bool
+    last_enqueued_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class CrawlTask(BaseModel):
+    id: int
+    query: str
+    deep: bool
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    jobs: Optional[List[Job]] = None
+
+    class Config:
+        from_attributes = True
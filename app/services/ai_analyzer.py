@@ -1,9 +1,13 @@
 import os
 import json
+import asyncio
 import google.genai as genai
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, ValidationError, field_validator
 from ..config import settings
+from ..database import SessionLocal
+from .score_cache import ScoreCache, cache_key
+from . import metrics
 import logging
 
 load_dotenv()
@@ -12,6 +16,7 @@ logger = logging.getLogger(__name__)
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY") or settings.gemini_api_key
 client = genai.Client(api_key=GEMINI_API_KEY) if GEMINI_API_KEY else None
+score_cache = ScoreCache(SessionLocal) if settings.ai_score_cache_enabled else None
 
 class AnalysisResult(BaseModel):
     score: int = Field(default=0, ge=0, le=100)
@@ -34,34 +39,176 @@ def _parse_ai_json(raw_text: str) -> AnalysisResult:
     data = json.loads(cleaned)
     return AnalysisResult.model_validate(data)
 
-def analyze_job(description: str, query: str) -> dict:
-    if not client:
-        return {"score": 0, "reason": "API Key not configured"}
-    try:
-        prompt = f"""
-        Analise a vaga abaixo para um perfil: "Desenvolvedor/Profissional focado em {query} (Júnior/Pleno)".
-        
+def _criteria(query: str) -> str:
+    return f"""
         Critérios:
         - Tecnologia principal deve ser {query}.
         - Se for vaga Sênior/Especialista: nota baixa (sou Júnior/Pleno).
         - Se for presencial (e não remoto): nota baixa.
-        
+        """
+
+def _build_prompt(description: str, query: str) -> str:
+    return f"""
+        Analise a vaga abaixo para um perfil: "Desenvolvedor/Profissional focado em {query} (Júnior/Pleno)".
+        {_criteria(query)}
         Responda APENAS um JSON: {{"score": 0-100, "reason": "motivo curto"}}
         
         Vaga:
         {description[:4000]}
         """
 
-        response = client.models.generate_content(
-            model=settings.gemini_model,
-            contents=prompt,
-        )
-        text_resp = getattr(response, "text", "") or ""
-        parsed = _parse_ai_json(text_resp)
-        return parsed.model_dump()
+def _build_batch_prompt(descriptions: list[str], query: str) -> str:
+    jobs = "\n".join(f"Vaga {i}:\n{description[:4000]}\n" for i, description in enumerate(descriptions, start=1))
+    return f"""
+        Analise cada uma das {len(descriptions)} vagas abaixo para um perfil: "Desenvolvedor/Profissional focado em {query} (Júnior/Pleno)".
+        {_criteria(query)}
+        Responda APENAS um JSON array com um objeto por vaga:
+        [{{"id": <número da vaga>, "score": 0-100, "reason": "motivo curto"}}]
+        
+        {jobs}
+        """
+
+def _parse_ai_json_array(raw_text: str) -> dict[int, AnalysisResult]:
+    cleaned = (raw_text or "").replace("```json", "").replace("```", "").strip()
+    data = json.loads(cleaned)
+    if not isinstance(data, list):
+        raise ValueError("expected a JSON array")
+    results = {}
+    for item in data:
+        if isinstance(item, dict) and "id" in item:
+            results[int(item["id"])] = AnalysisResult.model_validate(item)
+    return results
+
+def _estimate_tokens(text: str) -> int:
+    return len(text[:4000]) // 4 + 20
+
+async def _generate(prompt: str, kind: str = "single") -> str:
+    try:
+        with metrics.timed("ai_call"):
+            response = await client.aio.models.generate_content(
+                model=settings.gemini_model,
+                contents=prompt,
+            )
+    except Exception:
+        metrics.AI_CALLS.inc(kind=kind, outcome="error")
+        raise
+    metrics.AI_CALLS.inc(kind=kind, outcome="ok")
+    text = getattr(response, "text", "") or ""
+    # usage_metadata is missing on some responses (and on test doubles); estimate from length then.
+    usage = getattr(response, "usage_metadata", None)
+    metrics.AI_TOKENS.inc(getattr(usage, "prompt_token_count", None) or len(prompt) // 4, direction="prompt")
+    metrics.AI_TOKENS.inc(getattr(usage, "candidates_token_count", None) or len(text) // 4, direction="output")
+    return text
+
+async def _analyze_single(description: str, query: str) -> dict:
+    try:
+        parsed = _parse_ai_json(await _generate(_build_prompt(description, query)))
+        result = parsed.model_dump()
+        if score_cache is not None:
+            await asyncio.to_thread(score_cache.put, description, query, result)
+        return result
     except (ValidationError, json.JSONDecodeError) as e:
         logger.error("AI Parse Error: %s", e)
         return {"score": 0, "reason": "AI returned invalid JSON"}
     except Exception as e:
         logger.error("AI Lib Error: %s", e)
         return {"score": 0, "reason": "AI Error"}
+
+async def _analyze_batch(descriptions: list[str], query: str) -> list[dict | None]:
+    """Score several descriptions with one call; entries the model did not answer come back as None."""
+    try:
+        parsed = _parse_ai_json_array(await _generate(_build_batch_prompt(descriptions, query), "batch"))
+    except (ValidationError, ValueError, TypeError) as e:
+        logger.warning("AI batch parse error, falling back to single calls: %s", e)
+        return [None] * len(descriptions)
+    except Exception as e:
+        logger.error("AI batch Lib Error, falling back to single calls: %s", e)
+        return [None] * len(descriptions)
+    return [parsed[i].model_dump() if i in parsed else None for i in range(1, len(descriptions) + 1)]
+
+class BatchScorer:
+    """Collects scoring requests for one query and sends them to Gemini in packed batches.
+
+    A batch is flushed when it reaches `ai_batch_size` jobs, when the next job would
+    exceed `ai_batch_token_budget`, or `ai_batch_linger_seconds` after its first job.
+    Identical descriptions share one request, and batches whose answer cannot be
+    parsed are retried job by job.
+    """
+
+    def __init__(self, query: str):
+        self.query = query
+        self.batch_size = max(1, settings.ai_batch_size)
+        self.token_budget = settings.ai_batch_token_budget
+        self.linger = settings.ai_batch_linger_seconds
+        self._semaphore = asyncio.Semaphore(settings.ai_concurrency)
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._pending_tokens = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def score(self, description: str) -> dict:
+        if not client:
+            return {"score": 0, "reason": "API Key not configured"}
+        if score_cache is not None:
+            cached = await asyncio.to_thread(score_cache.get, description, self.query)
+            if cached is not None:
+                return cached
+
+        key = cache_key(description, self.query, settings.gemini_model)
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        tokens = _estimate_tokens(description)
+        if self._pending and self._pending_tokens + tokens > self.token_budget:
+            self._flush()
+        self._pending.append((description, future))
+        self._pending_tokens += tokens
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.linger, self._flush)
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future]]):
+        async def resolve(description: str, future: asyncio.Future, result: dict | None):
+            if result is None:
+                async with self._semaphore:
+                    result = await _analyze_single(description, self.query)
+            elif score_cache is not None:
+                await asyncio.to_thread(score_cache.put, description, self.query, result)
+            if not future.done():
+                future.set_result(result)
+
+        try:
+            if len(batch) == 1:
+                results = [None]
+            else:
+                async with self._semaphore:
+                    results = await _analyze_batch([description for description, _ in batch], self.query)
+            await asyncio.gather(*(
+                resolve(description, future, result)
+                for (description, future), result in zip(batch, results)
+            ))
+        except Exception as e:
+            logger.error("AI batch failed: %s", e)
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result({"score": 0, "reason": "AI Error"})
@@ -0,0 +1,72 @@
+import logging
+import time
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one upstream host.
+
+    `failure_threshold` consecutive failures open the circuit: requests fail fast for
+    `reset_timeout` seconds, then a single probe is let through (half-open). A successful
+    probe closes the circuit, a failed one opens it again for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int | None = None, reset_timeout: float | None = None):
+        self.failure_threshold = failure_threshold or settings.circuit_failure_threshold
+        self.reset_timeout = reset_timeout if reset_timeout is not None else settings.circuit_reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.counters = {"rejected": 0, "opened": 0}
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.counters["rejected"] += 1
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.counters["opened"] += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self):
+        """Give back a half-open probe slot when the probe ended without an outcome (cancelled)."""
+        self._probing = False
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures, **self.counters}
+
+class CircuitBreakers:
+    """One breaker per host, shared by every search in the process."""
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def for_host(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker()
+        return breaker
+
+    def stats(self) -> dict:
+        return {host: breaker.stats() for host, breaker in self._breakers.items()}
@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Hashable
+from sqlalchemy.orm import Session
+from .. import database
+from ..config import settings
+from ..models import job as models
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_BITS = 64
+# Below this many description words (e.g. the "Could not fetch description." placeholder)
+# a fingerprint would match unrelated jobs, so none is computed.
+_MIN_DESCRIPTION_WORDS = 20
+
+def _tokens(text: str) -> list[str]:
+    folded = unicodedata.normalize("NFKD", (text or "").lower())
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return _WORD.findall(folded)
+
+def simhash(text: str, shingle: int = 3) -> int:
+    """64-bit SimHash over word shingles; near-identical texts differ in only a few bits."""
+    words = _tokens(text)
+    if len(words) < shingle:
+        features = words
+    else:
+        features = [" ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1)]
+    weights = [0] * _BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        for bit in range(_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(_BITS) if weights[bit] > 0)
+
+def fingerprint(title: str, company: str, description: str | None) -> int | None:
+    """SimHash of title, company and description, or None when the description is too thin."""
+    if len(_tokens(description or "")) < _MIN_DESCRIPTION_WORDS:
+        return None
+    # The title drops the remote marker some sources add so mirrors on other boards still match.
+    return simhash(" ".join(((title or "").lstrip("🌐 "), company or "", description)))
+
+def _title_words(title: str) -> set[str]:
+    return set(_tokens((title or "").lstrip("🌐 ")))
+
+def same_posting(title: str, company: str, other_title: str, other_company: str, threshold: float | None = None) -> bool:
+    """Whether two postings whose fingerprints are close are really the same job.
+
+    The fingerprint is dominated by the description, so a company's Junior and Senior
+    openings with shared boilerplate land a bit or two apart. Companies must match and
+    titles must share at least `threshold` of their words (Jaccard).
+    """
+    threshold = settings.dedupe_title_similarity if threshold is None else threshold
+    if _tokens(company) != _tokens(other_company):
+        return False
+    words, other_words = _title_words(title), _title_words(other_title)
+    if not words or not other_words:
+        return words == other_words
+    return len(words & other_words) / len(words | other_words) >= threshold
+
+def to_signed(value: int) -> int:
+    """Store unsigned 64-bit fingerprints in a signed BIGINT column."""
+    return value - (1 << _BITS) if value >= 1 << (_BITS - 1) else value
+
+def to_unsigned(value: int) -> int:
+    return value + (1 << _BITS) if value < 0 else value
+
+class NearDuplicateIndex:
+    """LSH over SimHash fingerprints.
+
+    The 64 bits are split into `max_distance + 1` bands; two fingerprints within
+    `max_distance` bits of each other must agree on at least one whole band, so
+    looking up every band finds all near-duplicates without a full scan.
+    """
+
+    def __init__(self, max_distance: int | None = None):
+        self.max_distance = settings.dedupe_max_distance if max_distance is None else max_distance
+        self.bands = self.max_distance + 1
+        self.band_bits = _BITS // self.bands
+        self._buckets: dict[tuple[int, int], set[Hashable]] = defaultdict(set)
+        self._fingerprints: dict[Hashable, int] = {}
+        self.max_id = 0
+        self._lock = threading.Lock()
+
+    def _band_keys(self, fp: int):
+        mask = (1 << self.band_bits) - 1
+        for band in range(self.bands):
+            yield band, fp >> (band * self.band_bits) & mask
+
+    def _add(self, key: Hashable, fp: int):
+        self._fingerprints[key] = fp
+        for band_key in self._band_keys(fp):
+            self._buckets[band_key].add(key)
+
+    def add(self, key: Hashable, fp: int):
+        with self._lock:
+            self._add(key, fp)
+
+    def candidates(self, fp: int) -> list[Hashable]:
+        """Keys of stored fingerprints within `max_distance`, closest first."""
+        found: dict[Hashable, int] = {}
+        with self._lock:
+            for band_key in self._band_keys(fp):
+                for key in self._buckets.get(band_key, ()):
+                    if key not in found:
+                        found[key] = (self._fingerprints[key] ^ fp).bit_count()
+        return sorted((key for key, distance in found.items() if distance <= self.max_distance), key=found.__getitem__)
+
+    def find(self, fp: int) -> Hashable | None:
+        """Return the key of the closest stored fingerprint within `max_distance`, if any."""
+        return next(iter(self.candidates(fp)), None)
+
+    def stats(self) -> dict:
+        return {"fingerprints": len(self), "bands": self.bands, "max_distance": self.max_distance}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def warm(self, session_factory: Callable[[], Session], batch_size: int = 1000):
+        """Load stored fingerprints, computing them first for rows saved before fingerprinting existed."""
+        db = session_factory()
+        try:
+            last_id = 0
+            while True:
+                missing = (
+                    db.query(models.Job)
+                    .filter(models.Job.simhash.is_(None), models.Job.id > last_id)
+                    .order_by(models.Job.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not missing:
+                    break
+                for job in missing:
+                    fp = fingerprint(job.title, job.company, job.description)
+                    if fp is not None:
+                        job.simhash = to_signed(fp)
+                last_id = missing[-1].id
+                db.commit()
+            self.refresh(db)
+        finally:
+            db.close()
+        logger.info("Near-duplicate index warmed with %d jobs", len(self))
+
+    def refresh(self, db: Session, batch_size: int = 5000) -> int:
+        """Add the fingerprints of jobs stored since the last refresh, e.g. by the crawl worker."""
+        added = 0
+        last_id = database.rescan_floor(db, self.max_id)
+        while True:
+            rows = (
+                db.query(models.Job.id, models.Job.simhash)
+                .filter(models.Job.id > last_id, models.Job.simhash.isnot(None))
+                .order_by(models.Job.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return added
+            with self._lock:
+                for job_id, value in rows:
+                    if job_id not in self._fingerprints:
+                        self._add(job_id, to_unsigned(value))
+                        added += 1
+                self.max_id = max(self.max_id, rows[-1][0])
+            last_id = rows[-1][0]
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import httpx
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_STORED_HEADERS = ("content-type", "etag", "last-modified")
+# Access times are written back in batches of this many hits, and the size limit is
+# enforced once every this many stores, as in the score cache.
+_TOUCH_BATCH = 100
+_EVICT_EVERY = 200
+
+@dataclass
+class CacheEntry:
+    url: str
+    status_code: int
+    headers: dict
+    body: bytes
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    def validators(self) -> dict:
+        headers = {}
+        if self.headers.get("etag"):
+            headers["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+    def to_response(self) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.body,
+            request=httpx.Request("GET", self.url),
+        )
+
+class HttpCache:
+    """Disk-backed HTTP cache with per-kind TTLs, LRU eviction and conditional revalidation.
+
+    Hits do not write: access times are buffered and flushed every `_TOUCH_BATCH` hits
+    or with the next store. The table may exceed `max_entries` by up to `_EVICT_EVERY`
+    rows between evictions.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_entries: int | None = None,
+        listing_ttl: float | None = None,
+        detail_ttl: float | None = None,
+    ):
+        self.path = path or settings.http_cache_path
+        self.max_entries = max_entries or settings.http_cache_max_entries
+        self.ttls = {
+            "listing": listing_ttl if listing_ttl is not None else settings.http_cache_listing_ttl,
+            "detail": detail_ttl if detail_ttl is not None else settings.http_cache_detail_ttl,
+        }
+        self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}
+        self._stores_since_evict = 0
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_http_cache_accessed_at ON http_cache (accessed_at)")
+        self._conn.commit()
+
+    def _lookup(self, url: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, headers, body, fetched_at FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[url] = time.time()
+            if len(self._touched) >= _TOUCH_BATCH:
+                self._flush_touches()
+                self._conn.commit()
+        status_code, headers, body, fetched_at = row
+        return CacheEntry(url, status_code, json.loads(headers), body, fetched_at)
+
+    def _store(self, url: str, kind: str, response: httpx.Response):
+        headers = {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers}
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, kind, status_code, headers, body, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, kind, response.status_code, json.dumps(headers), response.content, now, now),
+            )
+            self._touched.pop(url, None)
+            self._flush_touches()
+            self._stores_since_evict += 1
+            evicted = 0
+            if self._stores_since_evict >= _EVICT_EVERY:
+                self._stores_since_evict = 0
+                evicted = self._evict()
+            self._conn.commit()
+        self.counters["stores"] += 1
+        self.counters["evictions"] += evicted
+
+    def _flush_touches(self):
+        """Write buffered access times; the caller holds the lock and commits."""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        self._conn.executemany(
+            "UPDATE http_cache SET accessed_at = MAX(accessed_at, ?) WHERE url = ?",
+            [(accessed_at, url) for url, accessed_at in touched.items()],
+        )
+
+    def _evict(self) -> int:
+        (entries,) = self._conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()
+        if entries <= self.max_entries:
+            return 0
+        return max(self._conn.execute(
+            "DELETE FROM http_cache WHERE url IN ("
+            "SELECT url FROM http_cache ORDER BY accessed_at LIMIT ?)",
+            (entries - self.max_entries,),
+        ).rowcount, 0)
+
+    def _refresh(self, url: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+            )
+            self._conn.commit()
+
+    async def fetch(
+        self,
+        url: str,
+        kind: str,
+        fetcher: Callable[[dict], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        """Serve `url` from cache when fresh, otherwise revalidate or refetch through `fetcher`."""
+        entry = await asyncio.to_thread(self._lookup, url)
+        if entry is not None and entry.is_fresh(self.ttls[kind]):
+            self.counters["hits"] += 1
+            return entry.to_response()
+
+        response = await fetcher(entry.validators() if entry else {})
+        if response.status_code == 304 and entry is not None:
+            self.counters["revalidated"] += 1
+            await asyncio.to_thread(self._refresh, url)
+            return entry.to_response()
+
+        self.counters["misses"] += 1
+        cacheable = (
+            response.status_code == 200
+            and "text/html" in response.headers.get("Content-Type", "")
+            and "no-store" not in response.headers.get("Cache-Control", "")
+        )
+        if cacheable:
+            try:
+                await asyncio.to_thread(self._store, url, kind, response)
+            except sqlite3.Error as e:
+                logger.warning("Failed to cache %s: %s", url, e)
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM http_cache"
+            ).fetchone()
+        return {**self.counters, "entries": entries, "bytes": size, "ttls": self.ttls}
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush_touches()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("HTTP cache access times not saved: %s", e)
+            self._conn.close()
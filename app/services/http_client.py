@@ -0,0 +1,158 @@
+import codecs
+import httpx
+import logging
+from collections import defaultdict
+from typing import Callable
+from fastapi import Request
+from urllib.parse import urlparse
+from ..config import settings
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+class HttpClientPool:
+    """Long-lived httpx client shared by every search.
+
+    Each host gets its own adaptive rate limiter and concurrency cap, so a slow or
+    throttling board never holds back the others.
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        http2: bool | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        limiter: RateLimiter | None = None,
+    ):
+        use_http2 = settings.http_http2 if http2 is None else http2
+        if use_http2 and not _http2_available():
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            use_http2 = False
+
+        limits = httpx.Limits(
+            max_connections=max_connections or settings.http_max_connections,
+            max_keepalive_connections=max_keepalive_connections or settings.http_max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry if keepalive_expiry is not None else settings.http_keepalive_expiry,
+        )
+        self.http2 = use_http2
+        self.client = httpx.AsyncClient(limits=limits, http2=use_http2, transport=transport)
+        self.limiter = limiter or RateLimiter()
+        self._host_stats = defaultdict(lambda: {
+            "requests": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "streamed_bytes": 0,
+            "stopped_early": 0,
+            "capped": 0,
+        })
+
+    async def get(
+        self,
+        url: str,
+        max_bytes: int | None = None,
+        stop: Callable[[str], bool] | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """GET `url` under the host's rate limit.
+
+        With `max_bytes` or `stop` the body is streamed instead: see `_read_bounded`.
+        """
+        host = urlparse(url).netloc
+        stats = self._host_stats[host]
+        host_limiter = self.limiter.for_host(host)
+        async with host_limiter.slot():
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+            try:
+                if max_bytes or stop is not None:
+                    response = await self._read_bounded(url, stats, max_bytes, stop, **kwargs)
+                else:
+                    response = await self.client.get(url, **kwargs)
+                host_limiter.record(response.status_code, response.headers.get("Retry-After"))
+                return response
+            except Exception:
+                stats["errors"] += 1
+                raise
+            finally:
+                stats["in_flight"] -= 1
+
+    async def _read_bounded(
+        self,
+        url: str,
+        stats: dict,
+        max_bytes: int | None,
+        stop: Callable[[str], bool] | None,
+        **kwargs,
+    ) -> httpx.Response:
+        """Stream an HTML body, stopping at `max_bytes` or as soon as `stop(text)` is true.
+
+        Status and Content-Type are checked before any of the body is read: anything but a
+        200 text/html page comes back with an empty body. `stop` receives the body decoded
+        chunk by chunk. The response holds only the bytes read so far. When the download is
+        cut short the connection is closed rather than drained.
+        """
+        async with self.client.stream("GET", url, **kwargs) as response:
+            headers = [
+                (name, value) for name, value in response.headers.multi_items()
+                if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+            ]
+            chunks: list[bytes] = []
+            if response.status_code == 200 and "text/html" in response.headers.get("Content-Type", ""):
+                decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    if max_bytes and size + len(chunk) > max_bytes:
+                        chunks.append(chunk[:max_bytes - size])
+                        size = max_bytes
+                        stats["capped"] += 1
+                        break
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if stop is not None and stop(decoder.decode(chunk)):
+                        stats["stopped_early"] += 1
+                        break
+                stats["streamed_bytes"] += size
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=b"".join(chunks),
+            request=response.request,
+        )
+
+    def stats(self) -> dict:
+        connections = []
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        if pool is not None:
+            connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "http2": self.http2,
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+            "hosts": {host: dict(values) for host, values in self._host_stats.items()},
+            "rate_limits": self.limiter.stats(),
+        }
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+def get_http_pool(request: Request) -> HttpClientPool:
+    return request.app.state.http_pool
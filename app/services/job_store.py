@@ -0,0 +1,98 @@
+import logging
+from typing import List
+from fastapi import HTTPException
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from .. import schemas
+from ..models import job as models
+from . import text_search
+from .dedupe import to_signed
+
+logger = logging.getLogger(__name__)
+
+def existing_jobs(db: Session, urls: List[str]) -> dict[str, schemas.Job]:
+    """Map each already-known URL, stored directly or as an alias, to its stored job."""
+    found = {
+        row.url: schemas.Job.model_validate(row)
+        for row in db.query(models.Job).filter(models.Job.url.in_(urls))
+    }
+    missing = [url for url in urls if url not in found]
+    if missing:
+        aliased = (
+            db.query(models.JobAlias.url, models.Job)
+            .join(models.Job, models.Job.id == models.JobAlias.job_id)
+            .filter(models.JobAlias.url.in_(missing))
+        )
+        for alias_url, job in aliased:
+            found[alias_url] = schemas.Job.model_validate(job)
+    return found
+
+def get_job(db: Session, job_id: int) -> schemas.Job | None:
+    job = db.get(models.Job, job_id)
+    return schemas.Job.model_validate(job) if job is not None else None
+
+def _insert(db: Session, model, conflict_column):
+    """Dialect-specific INSERT that skips conflicting rows, or None if unsupported."""
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model).on_conflict_do_nothing(index_elements=[conflict_column])
+
+def save_new_jobs(
+    db: Session,
+    new_jobs: List[schemas.JobCreate],
+    fingerprints: dict[str, int] | None = None,
+    aliases: dict[str, int | str] | None = None,
+) -> tuple[List[schemas.Job], List[schemas.Job]]:
+    """Insert the batch in one statement and record alias URLs.
+
+    `aliases` maps a duplicate URL to the canonical job id, or to the URL of a job in
+    this batch. Returns (inserted, already stored by a concurrent search).
+    """
+    fingerprints = fingerprints or {}
+    aliases = aliases or {}
+    rows = list({job_data.url: job_data.model_dump() for job_data in new_jobs}.values())
+    for row in rows:
+        fp = fingerprints.get(row["url"])
+        row["simhash"] = to_signed(fp) if fp is not None else None
+
+    stmt = _insert(db, models.Job, models.Job.url)
+    try:
+        if stmt is not None and db.get_bind().dialect.insert_returning:
+            inserted = list(db.scalars(stmt.returning(models.Job), rows)) if rows else []
+        else:
+            inserted = [models.Job(**row) for row in rows]
+            db.add_all(inserted)
+            db.flush()
+        text_search.index_jobs(db, inserted)
+        inserted_jobs = [schemas.Job.model_validate(db_job) for db_job in inserted]
+
+        # Rows another search inserted first came back from neither branch: read them once.
+        inserted_urls = {job.url for job in inserted_jobs}
+        raced = [row["url"] for row in rows if row["url"] not in inserted_urls]
+        existing = list(existing_jobs(db, raced).values()) if raced else []
+
+        ids_by_url = {job.url: job.id for job in inserted_jobs + existing}
+        alias_rows = []
+        for alias_url, target in aliases.items():
+            job_id = ids_by_url.get(target) if isinstance(target, str) else target
+            if job_id is not None:
+                alias_rows.append({"url": alias_url, "job_id": job_id})
+        if alias_rows:
+            alias_stmt = _insert(db, models.JobAlias, models.JobAlias.url)
+            if alias_stmt is not None:
+                db.execute(alias_stmt, alias_rows)
+            else:
+                known = {url for (url,) in db.query(models.JobAlias.url).filter(
+                    models.JobAlias.url.in_([alias_row["url"] for alias_row in alias_rows])
+                )}
+                db.add_all(models.JobAlias(**alias_row) for alias_row in alias_rows if alias_row["url"] not in known)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Database is not writable") from e
+    return inserted_jobs, existing
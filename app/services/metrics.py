@@ -0,0 +1,157 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable
+
+# Upper bounds, in seconds, shared by every latency histogram.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0, 0.0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += 1
+            series[2] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (buckets, count, total) in sorted(self._series.items()):
+                for bound, cumulative in zip(self.buckets, buckets):
+                    le = 'le="%g"' % bound
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {count}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total:g}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+REGISTRY: list[Counter | Histogram] = []
+
+STAGE_SECONDS = Histogram(
+    "vagahunter_stage_seconds",
+    "Time spent in each search stage (listing/detail fetch and parse, AI call, database work).",
+    ["stage", "host"],
+)
+REQUEST_SECONDS = Histogram(
+    "vagahunter_http_request_seconds",
+    "API request latency by route.",
+    ["method", "route", "status"],
+)
+FETCH_RETRIES = Counter("vagahunter_fetch_retries_total", "Upstream GETs retried after an error.", ["host"])
+FETCH_FAILURES = Counter("vagahunter_fetch_failures_total", "Listing or detail fetches that gave up.", ["host", "kind"])
+AI_CALLS = Counter("vagahunter_ai_calls_total", "Gemini requests by kind and outcome.", ["kind", "outcome"])
+AI_TOKENS = Counter("vagahunter_ai_tokens_total", "Gemini tokens by direction (prompt/output).", ["direction"])
+
+# Per-request stage totals for the Server-Timing header: stage -> [seconds, calls].
+_request_timings: contextvars.ContextVar[dict | None] = contextvars.ContextVar("request_timings", default=None)
+
+def record_stage(stage: str, seconds: float, host: str = ""):
+    STAGE_SECONDS.observe(seconds, stage=stage, host=host)
+    timings = _request_timings.get()
+    if timings is not None:
+        entry = timings.setdefault(stage, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+@contextmanager
+def timed(stage: str, host: str = ""):
+    """Time the block into the stage histogram and the current request's Server-Timing totals."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start, host)
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+def _server_timing(timings: dict, total: float) -> str:
+    entries = [
+        f'{stage};dur={seconds * 1000:.1f};desc="n={calls}"'
+        for stage, (seconds, calls) in sorted(timings.items())
+    ]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+class MetricsMiddleware:
+    """ASGI middleware that records request latency and adds a `Server-Timing` header.
+
+    Stage timings are summed over concurrent work, so a stage can exceed `total`.
+    Streaming responses send their headers before the work happens and only get `total`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: dict = {}
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = _server_timing(timings, time.perf_counter() - start)
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_SECONDS.observe(time.perf_counter() - start, method=scope["method"], route=route, status=status)
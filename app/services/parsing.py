@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from bs4 import BeautifulSoup
+from ..config import settings
+
+try:
+    from bs4.filter import ElementFilter
+except ImportError:  # beautifulsoup4 < 4.13: fall back to full-document parsing
+    ElementFilter = None
+
+try:
+    from lxml import etree
+except ImportError:  # detail downloads are then only bounded by the byte cap
+    etree = None
+
+logger = logging.getLogger(__name__)
+
+# Selectors used only as last-resort fallbacks; they cover the whole page, so a
+# targeted parse would not save anything.
+_WHOLE_PAGE_SELECTORS = {"html", "body"}
+
+@lru_cache(maxsize=None)
+def html_parser(name: str | None = None) -> str:
+    """Resolve the configured BeautifulSoup backend, falling back to the stdlib parser."""
+    name = name or settings.scraper_html_parser
+    if name == "lxml":
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            logger.warning("lxml is not installed; falling back to html.parser")
+            return "html.parser"
+    return name
+
+def _parse_simple_selector(selector: str) -> tuple[str | None, str | None, str | None]:
+    """Split `tag.class` / `tag#id` / `.class` / `tag` into (tag, class, id)."""
+    tag, css_class, css_id = selector, None, None
+    if "#" in tag:
+        tag, css_id = tag.split("#", 1)
+    if "." in tag:
+        tag, css_class = tag.split(".", 1)
+    return tag or None, css_class, css_id
+
+def _matches(rule: tuple[str | None, str | None, str | None], name, attrs) -> bool:
+    tag, css_class, css_id = rule
+    if tag and tag != name:
+        return False
+    if css_class and css_class not in str(attrs.get("class", "")).split():
+        return False
+    if css_id and attrs.get("id") != css_id:
+        return False
+    return True
+
+if ElementFilter is not None:
+    class _SelectorFilter(ElementFilter):
+        """Only build the subtrees rooted at elements matching simple CSS selectors."""
+
+        def __init__(self, selectors: list[str]):
+            super().__init__()
+            self.rules = [_parse_simple_selector(selector) for selector in selectors]
+
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            attrs = attrs or {}
+            return any(_matches(rule, name, attrs) for rule in self.rules)
+
+        def allow_string_creation(self, string: str) -> bool:
+            return False
+
+def _soup(html: bytes, parser: str, only: list[str] | None = None) -> BeautifulSoup:
+    if only and ElementFilter is not None:
+        return BeautifulSoup(html, parser, parse_only=_SelectorFilter(only))
+    return BeautifulSoup(html, parser)
+
+def parse_programathor_cards(html: bytes, limit: int, parser: str) -> list[tuple[str, str, str, bool]]:
+    """Return (title, company, href, is_remote) for each listing card."""
+    soup = _soup(html, parser, [".cell-list"])
+    cards = []
+    for card in soup.select(".cell-list")[:limit]:
+        title_elem = card.select_one(".cell-list-content h3")
+        anchor = card.find("a", href=True)
+        raw_href = card.get("href") or (anchor.get("href") if anchor else None)
+        if not title_elem or not isinstance(raw_href, str):
+            continue
+        company = "Programathor Job"
+        info_spans = card.select(".cell-list-content-icon span")
+        if info_spans:
+            company = info_spans[0].get_text(strip=True)
+        is_remote = "remoto" in card.get_text().lower()
+        cards.append((title_elem.get_text(strip=True), company, raw_href, is_remote))
+    return cards
+
+def parse_weworkremotely_cards(html: bytes, limit: int, parser: str) -> list[tuple[str, str, str, bool]]:
+    """Return (raw_title, company, href, is_remote) for each listing card."""
+    soup = _soup(html, parser, ["section.jobs"])
+    cards = []
+    for card in soup.select("section.jobs li.feature, section.jobs li.job")[:limit]:
+        anchor = card.find("a", href=True)
+        href = anchor.get("href") if anchor else None
+        if not isinstance(href, str):
+            continue
+        title_elem = card.select_one("span.title") or card.select_one("span.company")
+        company_elem = card.select_one("span.company") or card.select_one("span.company-name")
+        company = (company_elem.get_text(strip=True) if company_elem else "WeWorkRemotely").strip()
+        raw_title = title_elem.get_text(strip=True) if title_elem else ""
+        cards.append((raw_title, company, href, True))
+    return cards
+
+def parse_remoteok_cards(html: bytes, limit: int, parser: str) -> list[tuple[str, str, str, bool]]:
+    """Return (raw_title, company, href, is_remote) for each listing row."""
+    soup = _soup(html, parser, ["tr.job", "div.job"])
+    cards = []
+    rows = soup.select("tr.job") or soup.select("div.job")
+    for row in rows[:limit]:
+        raw_link = row.get("data-href") or row.get("data-url")
+        if not isinstance(raw_link, str):
+            anchor = row.find("a", href=True)
+            raw_link = anchor.get("href") if anchor else None
+        if not isinstance(raw_link, str):
+            continue
+        title_elem = row.select_one("h2") or row.select_one("a.preventLink")
+        company_elem = row.select_one("h3") or row.select_one("span.companyLink")
+        company = (company_elem.get_text(strip=True) if company_elem else "RemoteOK").strip()
+        raw_title = title_elem.get_text(strip=True) if title_elem else ""
+        cards.append((raw_title, company, raw_link, True))
+    return cards
+
+def _first_selector_text(soup: BeautifulSoup, selectors: list[str]) -> str | None:
+    for selector in selectors:
+        desc_div = soup.select_one(selector)
+        if desc_div:
+            text = desc_div.get_text(" ", strip=True)
+            if text:
+                return text[:5000]
+    return None
+
+def extract_description(html: bytes, selectors: list[str], parser: str) -> str | None:
+    """Extract the job description, building only the candidate subtrees when possible."""
+    targeted = [selector for selector in selectors if selector not in _WHOLE_PAGE_SELECTORS]
+    if targeted and ElementFilter is not None:
+        text = _first_selector_text(_soup(html, parser, targeted), targeted)
+        if text:
+            return text
+
+    soup = _soup(html, parser)
+    text = _first_selector_text(soup, selectors)
+    if text:
+        return text
+    fallback_text = soup.get_text(" ", strip=True)
+    return fallback_text[:5000] if fallback_text else None
+
+class DescriptionBoundary:
+    """Watch a detail page as it streams in and report when the description has been read.
+
+    Decoded text is fed to lxml's incremental HTML parser. Once the first element that
+    matches the preferred selector (the one `extract_description` tries first) closes,
+    the rest of the page is scripts and footers and the download can stop. Pages without
+    that element, or without lxml, are read to the end or up to the byte cap.
+    """
+
+    def __init__(self, selectors: list[str]):
+        targeted = [selector for selector in selectors if selector not in _WHOLE_PAGE_SELECTORS]
+        self.rule = _parse_simple_selector(targeted[0]) if targeted else None
+        self._parser = etree.HTMLPullParser(events=("start", "end")) if etree is not None and self.rule else None
+        self._target = None
+        self.closed = False
+
+    def __call__(self, text: str) -> bool:
+        """Feed the next decoded chunk; True once the description container has closed."""
+        if self._parser is None or self.closed:
+            return self.closed
+        try:
+            self._parser.feed(text)
+            for event, element in self._parser.read_events():
+                if event == "start":
+                    if self._target is None and _matches(self.rule, element.tag, element.attrib):
+                        self._target = element
+                elif element is self._target:
+                    self.closed = True
+                    break
+        except etree.LxmlError as e:
+            logger.debug("Incremental parse gave up: %s", e)
+            self._parser = None
+        return self.closed
+
+_executor: Executor | None = None
+
+def get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        workers = settings.scraper_parse_workers or None
+        if settings.scraper_parse_executor == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="html-parse")
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def run_parser(fn, *args):
+    """Run a parse function off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), fn, *args)
@@ -0,0 +1,132 @@
+import logging
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass
+from typing import Callable
+import numpy as np
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models import job as models
+from ..schemas import JobCreate
+
+logger = logging.getLogger(__name__)
+
+# Keeps technology names like "c#", "c++" and "node.js" as one term.
+_TERM = re.compile(r"\w[\w+#]*(?:\.\w+)*", re.UNICODE)
+_SENIOR = re.compile(r"\b(senior|sr|especialista|specialist|staff|principal|lead|lider|head|architect|arquiteto)\b")
+_JUNIOR = re.compile(r"\b(junior|jr|pleno|mid|trainee|estagio|estagiario|entry)\b")
+_ONSITE = re.compile(r"\b(presencial|on-site|onsite|in-office)\b")
+_REMOTE = re.compile(r"\b(remoto|remota|remote|home office|hibrido|hybrid|anywhere)\b")
+
+def _fold(text: str) -> str:
+    folded = unicodedata.normalize("NFKD", (text or "").lower())
+    return "".join(ch for ch in folded if not unicodedata.combining(ch))
+
+def _terms(text: str) -> list[str]:
+    return _TERM.findall(_fold(text))
+
+@dataclass
+class Verdict:
+    """Outcome of the local stage: `send` jobs go on to Gemini, the rest keep `score`/`reason`."""
+    send: bool
+    similarity: float
+    score: int = 0
+    reason: str = ""
+
+class HashedTfidf:
+    """TF-IDF over hashed terms, with document frequencies kept in one NumPy array.
+
+    Terms are hashed into `dim` buckets so the vocabulary never has to be stored,
+    and every document seen by `add` updates the IDF used by later comparisons.
+    """
+
+    def __init__(self, dim: int = 1 << 18):
+        self.dim = dim
+        self.df = np.zeros(dim, dtype=np.int32)
+        self.docs = 0
+
+    def _buckets(self, text: str) -> np.ndarray:
+        return np.fromiter(
+            (zlib.crc32(term.encode("utf-8")) % self.dim for term in _terms(text)),
+            dtype=np.int64,
+        )
+
+    def add(self, text: str):
+        buckets = np.unique(self._buckets(text))
+        self.df[buckets] += 1
+        self.docs += 1
+
+    def vector(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        """Sparse L2-normalized vector as (sorted bucket indices, weights)."""
+        buckets, counts = np.unique(self._buckets(text), return_counts=True)
+        if not len(buckets):
+            return buckets, counts.astype(np.float64)
+        idf = np.log((1 + self.docs) / (1 + self.df[buckets])) + 1.0
+        weights = (1.0 + np.log(counts)) * idf
+        return buckets, weights / np.linalg.norm(weights)
+
+    def similarity(self, query: tuple[np.ndarray, np.ndarray], text: str) -> float:
+        q_buckets, q_weights = query
+        d_buckets, d_weights = self.vector(text)
+        _, q_at, d_at = np.intersect1d(q_buckets, d_buckets, assume_unique=True, return_indices=True)
+        return float(np.dot(q_weights[q_at], d_weights[d_at]))
+
+class LocalRanker:
+    """Cheap pre-filter that decides which scraped jobs are worth a Gemini call.
+
+    Mirrors the criteria of the AI prompt: senior titles and explicitly on-site
+    postings are rejected by keyword rules, and descriptions whose TF-IDF similarity
+    to the query is below `prerank_min_similarity` are treated as another stack.
+    """
+
+    def __init__(self, min_similarity: float | None = None):
+        self.min_similarity = settings.prerank_min_similarity if min_similarity is None else min_similarity
+        self.tfidf = HashedTfidf()
+        self.counters = {"checked": 0, "sent": 0, "senior": 0, "onsite": 0, "off_topic": 0}
+
+    def warm(self, session_factory: Callable[[], Session], limit: int = 5000):
+        """Seed document frequencies with the most recent stored descriptions."""
+        db = session_factory()
+        try:
+            rows = (
+                db.query(models.Job.description)
+                .filter(models.Job.description.isnot(None))
+                .order_by(models.Job.id.desc())
+                .limit(limit)
+            )
+            for (description,) in rows:
+                self.tfidf.add(description)
+        finally:
+            db.close()
+        logger.info("Local ranker warmed with %d descriptions", self.tfidf.docs)
+
+    def observe(self, description: str | None):
+        if description:
+            self.tfidf.add(description)
+
+    def query_vector(self, query: str) -> tuple[np.ndarray, np.ndarray]:
+        return self.tfidf.vector(query)
+
+    def check(self, job: JobCreate, query: str, query_vector: tuple[np.ndarray, np.ndarray] | None = None) -> Verdict:
+        self.counters["checked"] += 1
+        title = _fold(job.title)
+        if _SENIOR.search(title) and not _JUNIOR.search(title):
+            self.counters["senior"] += 1
+            return Verdict(False, 0.0, 10, "Vaga sênior (filtro local)")
+
+        text = _fold(f"{job.title} {job.description or ''}")
+        if not job.is_remote and _ONSITE.search(text) and not _REMOTE.search(text):
+            self.counters["onsite"] += 1
+            return Verdict(False, 0.0, 10, "Vaga presencial (filtro local)")
+
+        similarity = self.tfidf.similarity(query_vector or self.query_vector(query), f"{job.title} {job.description or ''}")
+        if similarity < self.min_similarity:
+            self.counters["off_topic"] += 1
+            return Verdict(False, similarity, min(30, round(similarity * 100)), f"{query} não é a tecnologia principal (filtro local)")
+
+        self.counters["sent"] += 1
+        return Verdict(True, similarity)
+
+    def stats(self) -> dict:
+        return {**self.counters, "documents": self.tfidf.docs, "min_similarity": self.min_similarity}
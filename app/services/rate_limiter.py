@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUSES = {429, 503}
+
+@dataclass
+class HostPolicy:
+    rate: float
+    burst: int
+    concurrency: int
+
+def default_policy() -> HostPolicy:
+    rate = 1 / settings.scraper_sleep_seconds if settings.scraper_sleep_seconds > 0 else 0.0
+    return HostPolicy(rate=rate, burst=settings.scraper_host_burst, concurrency=settings.http_per_host_connections)
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class HostLimiter:
+    """Token bucket plus concurrency cap for one host, adapting its rate to the host's health.
+
+    A rate of 0 disables the bucket and keeps only the concurrency cap.
+    """
+
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self.rate = policy.rate
+        self.min_rate = policy.rate / 16
+        self.tokens = float(policy.burst)
+        self.blocked_until = 0.0
+        self.healthy_streak = 0
+        self.counters = {"requests": 0, "throttled": 0, "waited_seconds": 0.0}
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(policy.concurrency)
+
+    def _refill(self, now: float):
+        self.tokens = min(self.policy.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def _take_token(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.rate <= 0:
+                    return
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+                self.counters["waited_seconds"] += delay
+                await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def slot(self):
+        # The token comes first, so a request waiting out the rate limit does not hold
+        # one of the host's connection slots meanwhile.
+        await self._take_token()
+        async with self._semaphore:
+            self.counters["requests"] += 1
+            yield
+
+    def record(self, status_code: int, retry_after: str | None = None):
+        if status_code in THROTTLE_STATUSES:
+            self.counters["throttled"] += 1
+            self.healthy_streak = 0
+            self.tokens = 0.0
+            if self.rate > 0:
+                self.rate = max(self.min_rate, self.rate / 2)
+            delay = parse_retry_after(retry_after)
+            if delay:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + min(delay, settings.scraper_max_retry_after))
+            return
+        if status_code < 500:
+            self.healthy_streak += 1
+            if self.healthy_streak >= settings.scraper_rate_ramp_after and self.rate < self.policy.rate:
+                self.rate = min(self.policy.rate, self.rate * 1.5)
+                self.healthy_streak = 0
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "rate": round(self.rate, 3),
+            "max_rate": self.policy.rate,
+            "concurrency": self.policy.concurrency,
+            "blocked_for": round(max(0.0, self.blocked_until - time.monotonic()), 3),
+        }
+
+class RateLimiter:
+    """Independent HostLimiter per host, configured from `scraper_host_limits` overrides."""
+
+    def __init__(self, overrides: dict[str, dict] | None = None):
+        self.overrides = settings.scraper_host_limits if overrides is None else overrides
+        self._hosts: dict[str, HostLimiter] = {}
+
+    def for_host(self, host: str) -> HostLimiter:
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            policy = default_policy()
+            override = self.overrides.get(host) or self.overrides.get(host.removeprefix("www.")) or {}
+            for field in ("rate", "burst", "concurrency"):
+                if field in override:
+                    setattr(policy, field, type(getattr(policy, field))(override[field]))
+            limiter = HostLimiter(policy)
+            self._hosts[host] = limiter
+        return limiter
+
+    def stats(self) -> dict:
+        return {host: limiter.stats() for host, limiter in self._hosts.items()}
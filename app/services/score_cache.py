@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.score_cache import ScoreCacheEntry
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# Hits are written back in batches of this many, and the size limit is enforced
+# once every this many stores, so neither reads nor writes pay for it each time.
+_TOUCH_BATCH = 100
+_EVICT_EVERY = 500
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", (text or "").lower()).strip()
+
+def cache_key(description: str, query: str, model: str) -> str:
+    """Content address of a scoring request: only the part of the description the prompt sees counts."""
+    payload = "\x1f".join((_normalize(description[:4000]), _normalize(query), model))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ScoreCache:
+    """Persistent memo of AI scores keyed by (normalized description, query, model).
+
+    Lookups do not write: hit counts and access times are buffered and flushed in one
+    statement per `_TOUCH_BATCH` hits (or with the next store). The table may grow past
+    `max_entries` by up to `_EVICT_EVERY` rows between evictions.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], max_entries: int | None = None, ttl_days: int | None = None):
+        self.session_factory = session_factory
+        self.max_entries = max_entries or settings.ai_score_cache_max_entries
+        self.ttl = timedelta(days=ttl_days or settings.ai_score_cache_ttl_days)
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._touched: dict[str, tuple[int, datetime]] = {}
+        self._lock = threading.Lock()
+        self._stores_since_evict = 0
+
+    def get(self, description: str, query: str, model: str | None = None) -> dict | None:
+        key = cache_key(description, query, model or settings.gemini_model)
+        db = self.session_factory()
+        try:
+            entry = db.get(ScoreCacheEntry, key)
+            now = datetime.now(timezone.utc)
+            created_at = entry.created_at if entry is not None else None
+            if created_at is not None and created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            if entry is None or (created_at is not None and now - created_at > self.ttl):
+                self.counters["misses"] += 1
+                return None
+            self.counters["hits"] += 1
+            result = {"score": entry.score, "reason": entry.reason}
+            db.rollback()
+            with self._lock:
+                hits, _ = self._touched.get(key, (0, now))
+                self._touched[key] = (hits + 1, now)
+                flush = len(self._touched) >= _TOUCH_BATCH
+            if flush:
+                self._flush_touches(db)
+            return result
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("Score cache lookup failed: %s", e)
+            return None
+        finally:
+            db.close()
+
+    def put(self, description: str, query: str, result: dict, model: str | None = None):
+        model = model or settings.gemini_model
+        db = self.session_factory()
+        try:
+            db.merge(ScoreCacheEntry(
+                key=cache_key(description, query, model),
+                model=model,
+                query=_normalize(query),
+                score=int(result.get("score", 0)),
+                reason=result.get("reason", "N/A"),
+                hits=0,
+                created_at=datetime.now(timezone.utc),
+                last_used_at=datetime.now(timezone.utc),
+            ))
+            db.commit()
+            self.counters["stores"] += 1
+            self._flush_touches(db)
+            with self._lock:
+                self._stores_since_evict += 1
+                evict = self._stores_since_evict >= _EVICT_EVERY
+                if evict:
+                    self._stores_since_evict = 0
+            if evict:
+                self._evict(db)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("Score cache store failed: %s", e)
+        finally:
+            db.close()
+
+    def _flush_touches(self, db: Session):
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return
+        table = ScoreCacheEntry.__table__
+        try:
+            db.execute(
+                update(table)
+                .where(table.c.key == bindparam("b_key"))
+                .values(hits=table.c.hits + bindparam("b_hits"), last_used_at=bindparam("b_used")),
+                [{"b_key": key, "b_hits": hits, "b_used": used} for key, (hits, used) in touched.items()],
+            )
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("Score cache access times not saved: %s", e)
+
+    def _evict(self, db: Session):
+        if db.query(ScoreCacheEntry.key).count() <= self.max_entries:
+            return
+        stale = (
+            db.query(ScoreCacheEntry.key)
+            .order_by(ScoreCacheEntry.last_used_at.desc())
+            .offset(self.max_entries)
+            .subquery()
+        )
+        evicted = (
+            db.query(ScoreCacheEntry)
+            .filter(ScoreCacheEntry.key.in_(db.query(stale.c.key)))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        self.counters["evictions"] += evicted
+
+    def stats(self) -> dict:
+        db = self.session_factory()
+        try:
+            entries = db.query(ScoreCacheEntry).count()
+        finally:
+            db.close()
+        return {**self.counters, "entries": entries, "max_entries": self.max_entries}
@@ -1,23 +1,103 @@
 import asyncio
-import httpx
-from bs4 import BeautifulSoup
-from typing import List
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, List
 from tenacity import retry, stop_after_attempt, wait_fixed
-from ..schemas import JobCreate
+from ..schemas import Job, JobCreate
 from ..config import settings
+from .http_client import HttpClientPool
+from .http_cache import HttpCache
+from .url_index import KnownUrlIndex
+from .circuit_breaker import CircuitBreakers, CircuitOpenError
+from . import metrics
+from .parsing import (
+    DescriptionBoundary,
+    extract_description,
+    html_parser,
+    parse_programathor_cards,
+    parse_remoteok_cards,
+    parse_weworkremotely_cards,
+    run_parser,
+)
 import logging
-from urllib.parse import urlparse, urlunparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 logger = logging.getLogger(__name__)
 
+# Query parameters that only track where a click came from; the same posting shared
+# through a newsletter or an ad must normalize to the same URL.
+_TRACKING_PARAMS = {"ref", "referrer", "gclid", "fbclid", "mc_cid", "mc_eid"}
+# Times a listing page that failed is requested before the crawl gives up on it.
+_LISTING_ATTEMPTS = 3
+
+def _count_retry(retry_state):
+    metrics.FETCH_RETRIES.inc(host=urlparse(retry_state.args[2]).netloc)
+
+def clean_query(query: str) -> str:
+    """Normalize a user query into the slug the sources expect (`"Data Science"` -> `"data-science"`)."""
+    return (query or "").lower().strip().replace(" ", "-")
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    base_url: str
+    listing_url: Callable[[str, int], str]
+    parse_cards: Callable[[bytes, int, str], list]
+    detail_selectors: list[str]
+    remote_marker: bool = True
+
+def _paged(url: str, page: int, param: str = "page", page_size: int | None = None) -> str:
+    """Append the page parameter for pages after the first."""
+    if page <= 1:
+        return url
+    value = (page - 1) * page_size if page_size else page
+    return f"{url}{'&' if '?' in url else '?'}{param}={value}"
+
+SOURCES = (
+    Source(
+        name="Programathor",
+        base_url="https://programathor.com.br",
+        listing_url=lambda q, page: _paged(f"https://programathor.com.br/jobs-{q}", page),
+        parse_cards=parse_programathor_cards,
+        detail_selectors=[".line-height-2-4", "article", "body"],
+        remote_marker=False,
+    ),
+    Source(
+        name="WeWorkRemotely",
+        base_url="https://weworkremotely.com",
+        listing_url=lambda q, page: _paged(f"https://weworkremotely.com/remote-jobs/search?term={q}", page),
+        parse_cards=parse_weworkremotely_cards,
+        detail_selectors=["div.listing-container", "div#job-listing", "article", "main"],
+    ),
+    Source(
+        name="RemoteOK",
+        base_url="https://remoteok.com",
+        listing_url=lambda q, page: _paged(f"https://remoteok.com/remote-{q}-jobs", page, "offset", 20),
+        parse_cards=parse_remoteok_cards,
+        detail_selectors=["div.description", "section.description", "article", "main"],
+    ),
+)
+
 class JobScraper:
-    def __init__(self):
+    def __init__(
+        self,
+        http: HttpClientPool | None = None,
+        cache: HttpCache | None = None,
+        url_index: KnownUrlIndex | None = None,
+        breakers: CircuitBreakers | None = None,
+    ):
+        self.http = http
+        self.cache = cache
+        self.url_index = url_index
+        self.breakers = breakers
+        # Cards found by the last iter_jobs() whose details never arrived (deadline or open circuit).
+        self.pending: List[JobCreate] = []
+        # Stored jobs for the URLs the last iter_jobs() found already known, by URL.
+        self.stored: dict[str, Job] = {}
         self.headers = {
             "User-Agent": "Mozilla/5.0 (compatible; VagaHunter/1.0; +https://github.com/)",
             "Accept": "text/html,application/xhtml+xml",
             "Accept-Language": "en-US,en;q=0.8,pt-BR;q=0.7",
         }
-        self._detail_semaphore = asyncio.Semaphore(4)
 
     def _normalize_url(self, url: str, base: str | None = None) -> str:
         """Normalize URLs to avoid duplicates and ensure scheme."""
@@ -29,7 +109,11 @@ class JobScraper:
         parsed = urlparse(cleaned)
         if not parsed.scheme:
             parsed = parsed._replace(scheme="https")
-        normalized = urlunparse(parsed._replace(fragment=""))
+        query = urlencode([
+            (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith("utm_")
+        ])
+        normalized = urlunparse(parsed._replace(query=query, fragment=""))
         return normalized
 
     def _remote_title(self, title: str, company: str | None = None) -> str:
@@ -41,203 +125,326 @@ class JobScraper:
             base = f"🌐 {base}"
         return base
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1), reraise=True)
-    async def _get(self, client: httpx.AsyncClient, url: str, timeout: int):
-        return await client.get(url, headers=self.headers, timeout=timeout, follow_redirects=True)
-
-    async def _fetch_description(self, client: httpx.AsyncClient, link: str, selectors: list[str]) -> str:
-        async with self._detail_semaphore:
-            await asyncio.sleep(settings.scraper_sleep_seconds)
-            try:
-                job_resp = await self._get(client, link, settings.scraper_detail_timeout)
-                if job_resp.status_code == 200 and "text/html" in job_resp.headers.get("Content-Type", ""):
-                    job_soup = BeautifulSoup(job_resp.content, "html.parser")
-                    for selector in selectors:
-                        desc_div = job_soup.select_one(selector)
-                        if desc_div:
-                            text = desc_div.get_text(" ", strip=True)
-                            if text:
-                                return text[:5000]
-                    fallback_text = job_soup.get_text(" ", strip=True)
-                    if fallback_text:
-                        return fallback_text[:5000]
-            except Exception as e:
-                logger.warning("Failed to fetch details for %s: %s", link, e)
-            return "Could not fetch description."
+    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1), reraise=True, before_sleep=_count_retry)
+    async def _get(
+        self,
+        client: HttpClientPool,
+        url: str,
+        timeout: int,
+        headers: dict | None = None,
+        selectors: list[str] | None = None,
+    ):
+        """GET `url`; with the detail `selectors` the page is streamed and read only up to
+        `scraper_detail_max_bytes` or until the description container has closed."""
+        request_headers = {**self.headers, **(headers or {})}
+        if selectors is None:
+            return await client.get(url, headers=request_headers, timeout=timeout, follow_redirects=True)
+        return await client.get(
+            url,
+            max_bytes=settings.scraper_detail_max_bytes,
+            stop=DescriptionBoundary(selectors),
+            headers=request_headers,
+            timeout=timeout,
+            follow_redirects=True,
+        )
 
-    async def _scrape_programathor(self, client: httpx.AsyncClient, clean_query: str) -> List[JobCreate]:
-        results: List[JobCreate] = []
-        url = f"https://programathor.com.br/jobs-{clean_query}"
+    async def _guarded_get(
+        self,
+        client: HttpClientPool,
+        url: str,
+        timeout: int,
+        headers: dict | None = None,
+        selectors: list[str] | None = None,
+    ):
+        """`_get` behind the host's circuit breaker: fails fast while the host is unhealthy."""
+        if self.breakers is None:
+            return await self._get(client, url, timeout, headers, selectors)
+        host = urlparse(url).netloc
+        breaker = self.breakers.for_host(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}")
         try:
-            response = await self._get(client, url, settings.scraper_timeout)
-            if response.status_code != 200 or "text/html" not in response.headers.get("Content-Type", ""):
-                return results
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            cards = soup.select(".cell-list")
-            detail_tasks = []
-            meta = []
-            for card in cards[: settings.scraper_max_results]:
-                title_elem = card.select_one(".cell-list-content h3")
-                anchor = card.find("a", href=True)
-                raw_href = card.get("href") or (anchor.get("href") if anchor else None)
-                link_elem = raw_href if isinstance(raw_href, str) else None
-                if not title_elem or not link_elem:
-                    continue
+            response = await self._get(client, url, timeout, headers, selectors)
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
 
-                title = title_elem.get_text(strip=True)
-                link = self._normalize_url(f"https://programathor.com.br{link_elem}")
-                company = "Programathor Job"
-                info_spans = card.select(".cell-list-content-icon span")
-                if info_spans:
-                    company = info_spans[0].get_text(strip=True)
-                is_remote = "remoto" in card.get_text().lower()
+    async def _fetch(self, client: HttpClientPool, url: str, timeout: int, kind: str, selectors: list[str] | None = None):
+        """GET through the HTTP cache when one is configured; `kind` selects the freshness policy."""
+        if self.cache is None:
+            return await self._guarded_get(client, url, timeout, selectors=selectors)
+        return await self.cache.fetch(
+            url, kind, lambda headers: self._guarded_get(client, url, timeout, headers, selectors)
+        )
 
-                if not link:
-                    continue
-                meta.append((title, company, link, is_remote))
-                detail_tasks.append(asyncio.create_task(self._fetch_description(client, link, [".line-height-2-4", "article", "body"])))
+    async def _fetch_description(self, client: HttpClientPool, link: str, selectors: list[str]) -> str | None:
+        """Description text, a placeholder when the page failed, or None while the host's circuit is open."""
+        host = urlparse(link).netloc
+        try:
+            with metrics.timed("detail_fetch", host):
+                job_resp = await self._fetch(client, link, settings.scraper_detail_timeout, "detail", selectors)
+            if job_resp.status_code == 200 and "text/html" in job_resp.headers.get("Content-Type", ""):
+                with metrics.timed("detail_parse", host):
+                    text = await run_parser(extract_description, job_resp.content, selectors, html_parser())
+                if text:
+                    return text
+            else:
+                metrics.FETCH_FAILURES.inc(host=host, kind="detail")
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            metrics.FETCH_FAILURES.inc(host=host, kind="detail")
+            logger.warning("Failed to fetch details for %s: %s", link, e)
+        return "Could not fetch description."
 
-            descriptions = await asyncio.gather(*detail_tasks, return_exceptions=True)
-            for (title, company, link, is_remote), desc in zip(meta, descriptions):
-                description = desc if isinstance(desc, str) else "Could not fetch description."
-                results.append(JobCreate(
-                    title=title,
-                    company=company,
-                    url=link,
-                    source="Programathor",
-                    is_remote=is_remote,
-                    description=description[:5000],
-                ))
+    async def _known_urls(self, links: list[str]) -> set[str]:
+        if self.url_index is None or not links:
+            return set()
+        try:
+            with metrics.timed("db_lookup"):
+                known = await self.url_index.lookup(links)
         except Exception as e:
-            logger.error("Error scraping Programathor: %s", e)
-        return results
+            logger.warning("Known-URL check failed: %s", e)
+            return set()
+        self.stored.update(known)
+        return set(known)
+
+    async def _iter_descriptions(
+        self,
+        client: HttpClientPool,
+        links: list[str],
+        selectors: list[str],
+    ) -> AsyncIterator[tuple[str, str | None]]:
+        """Yield (link, description) as each detail page completes.
 
-    async def _scrape_weworkremotely(self, client: httpx.AsyncClient, clean_query: str) -> List[JobCreate]:
-        results: List[JobCreate] = []
-        url = f"https://weworkremotely.com/remote-jobs/search?term={clean_query}"
+        URLs already stored are yielded first with a None description and cost no request.
+        Links skipped because the host's circuit is open are not yielded at all.
+        """
+        known = await self._known_urls(links)
+        for link in links:
+            if link in known:
+                yield link, None
+
+        async def describe(link: str) -> tuple[str, str | None]:
+            return link, await self._fetch_description(client, link, selectors)
+
+        tasks = [asyncio.create_task(describe(link)) for link in links if link not in known]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                link, description = await next_done
+                if description is not None:
+                    yield link, description[:5000]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _listing_cards(
+        self, client: HttpClientPool, source: Source, clean_query: str, page: int, limit: int
+    ) -> list | None:
+        """Cards on one listing page: [] past the last page, None when the page could not be read."""
+        url = source.listing_url(clean_query, page)
+        host = urlparse(url).netloc
         try:
-            response = await self._get(client, url, settings.scraper_timeout)
+            with metrics.timed("listing_fetch", host):
+                response = await self._fetch(client, url, settings.scraper_timeout, "listing")
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                # Boards answer 404 for a page past the end of the results.
+                return []
             if response.status_code != 200 or "text/html" not in response.headers.get("Content-Type", ""):
-                return results
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            cards = soup.select("section.jobs li.feature, section.jobs li.job")
-            detail_tasks = []
-            meta = []
-            for card in cards[: settings.scraper_max_results]:
-                anchor = card.find("a", href=True)
-                href = anchor.get("href") if anchor else None
-                if not isinstance(href, str):
-                    continue
-                link = self._normalize_url(href, base="https://weworkremotely.com")
-                if not link:
-                    continue
+                metrics.FETCH_FAILURES.inc(host=host, kind="listing")
+                return None
+            with metrics.timed("listing_parse", host):
+                return await run_parser(source.parse_cards, response.content, limit, html_parser())
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            metrics.FETCH_FAILURES.inc(host=host, kind="listing")
+            logger.error("Error scraping %s (page %d): %s", source.name, page, e)
+            return None
+
+    async def _scrape_source(
+        self,
+        client: HttpClientPool,
+        source: Source,
+        clean_query: str,
+        deep: bool = False,
+        found: dict[str, JobCreate] | None = None,
+    ) -> AsyncIterator[JobCreate]:
+        """Crawl one source's listing pages and stream each card through the detail stage.
 
-                title_elem = card.select_one("span.title") or card.select_one("span.company")
-                company_elem = card.select_one("span.company") or card.select_one("span.company-name")
-                company = (company_elem.get_text(strip=True) if company_elem else "WeWorkRemotely").strip()
-                raw_title = title_elem.get_text(strip=True) if title_elem else ""
-                title = self._remote_title(raw_title, company)
-
-                meta.append((title, company, link))
-                detail_tasks.append(asyncio.create_task(self._fetch_description(
-                    client,
-                    link,
-                    ["div.listing-container", "div#job-listing", "article", "main"]
-                )))
-
-            descriptions = await asyncio.gather(*detail_tasks, return_exceptions=True)
-            for (title, company, link), desc in zip(meta, descriptions):
-                description = desc if isinstance(desc, str) else "Could not fetch description."
-                results.append(JobCreate(
+        Outside deep mode only the first page is read, capped at `scraper_max_results`. In
+        deep mode pages are fetched `scraper_deep_page_window` at a time (the per-host
+        limiter keeps this polite) until a page adds no new cards or the page/item budget
+        runs out; each page's cards go to the detail stage as soon as the page is parsed.
+        A page that fails (5xx, timeout, open circuit) is retried with the next window, up
+        to `_LISTING_ATTEMPTS` times, and does not end the crawl; the host's breaker and
+        rate limiter have already recorded the failure.
+        """
+        max_pages = settings.scraper_deep_max_pages if deep else 1
+        max_items = settings.scraper_deep_max_items if deep else settings.scraper_max_results
+        window = max(1, settings.scraper_deep_page_window) if deep else 1
+        meta: dict[str, tuple[str, str, bool]] = {}
+        results: asyncio.Queue = asyncio.Queue()
+        detail_tasks: list[asyncio.Task] = []
+
+        async def describe(links: list[str]):
+            async for link, description in self._iter_descriptions(client, links, source.detail_selectors):
+                title, company, is_remote = meta[link]
+                await results.put(JobCreate(
                     title=title,
                     company=company,
                     url=link,
-                    source="WeWorkRemotely",
-                    is_remote=True,
-                    description=description[:5000],
+                    source=source.name,
+                    is_remote=is_remote,
+                    description=description,
                 ))
-        except Exception as e:
-            logger.error("Error scraping WeWorkRemotely: %s", e)
-        return results
 
-    async def _scrape_remoteok(self, client: httpx.AsyncClient, clean_query: str) -> List[JobCreate]:
-        results: List[JobCreate] = []
-        url = f"https://remoteok.com/remote-{clean_query}-jobs"
+        async def crawl():
+            try:
+                page = 1
+                retry_pages: list[int] = []
+                attempts: dict[int, int] = {}
+                while (retry_pages or page <= max_pages) and len(meta) < max_items:
+                    pages, retry_pages = retry_pages[:window], retry_pages[window:]
+                    while len(pages) < window and page <= max_pages:
+                        pages.append(page)
+                        page += 1
+                    listings = await asyncio.gather(*(
+                        self._listing_cards(client, source, clean_query, number, max_items) for number in pages
+                    ))
+                    exhausted = False
+                    for number, cards in zip(pages, listings):
+                        if cards is None:
+                            attempts[number] = attempts.get(number, 0) + 1
+                            if attempts[number] < _LISTING_ATTEMPTS:
+                                metrics.FETCH_RETRIES.inc(host=urlparse(source.base_url).netloc)
+                                retry_pages.append(number)
+                            continue
+                        new_links = []
+                        for raw_title, company, href, is_remote in cards:
+                            link = self._normalize_url(href, base=source.base_url)
+                            if not link or link in meta or len(meta) >= max_items:
+                                continue
+                            title = self._remote_title(raw_title, company) if source.remote_marker else raw_title
+                            meta[link] = (title, company, is_remote)
+                            if found is not None:
+                                found[link] = JobCreate(
+                                    title=title, company=company, url=link, source=source.name, is_remote=is_remote
+                                )
+                            new_links.append(link)
+                        if new_links:
+                            detail_tasks.append(asyncio.create_task(describe(new_links)))
+                        else:
+                            exhausted = True
+                    if exhausted:
+                        # Later pages are empty too; only failed earlier pages are still worth a retry.
+                        page = max_pages + 1
+            except Exception as e:
+                logger.error("Error scraping %s: %s", source.name, e)
+            finally:
+                await asyncio.gather(*detail_tasks, return_exceptions=True)
+                await results.put(None)
+
+        crawler = asyncio.create_task(crawl())
         try:
-            response = await self._get(client, url, settings.scraper_timeout)
-            if response.status_code != 200 or "text/html" not in response.headers.get("Content-Type", ""):
-                return results
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            rows = soup.select("tr.job") or soup.select("div.job")
-            detail_tasks = []
-            meta = []
-            for row in rows[: settings.scraper_max_results]:
-                raw_link = row.get("data-href") or row.get("data-url")
-                if not isinstance(raw_link, str):
-                    anchor = row.find("a", href=True)
-                    raw_link = anchor.get("href") if anchor else None
-                if not isinstance(raw_link, str):
-                    continue
-                link = self._normalize_url(raw_link, base="https://remoteok.com")
-                if not link:
-                    continue
+            while (job := await results.get()) is not None:
+                yield job
+        finally:
+            crawler.cancel()
+            for task in detail_tasks:
+                task.cancel()
 
-                title_elem = row.select_one("h2") or row.select_one("a.preventLink")
-                company_elem = row.select_one("h3") or row.select_one("span.companyLink")
-                company = (company_elem.get_text(strip=True) if company_elem else "RemoteOK").strip()
-                raw_title = title_elem.get_text(strip=True) if title_elem else ""
-                title = self._remote_title(raw_title, company)
-
-                meta.append((title, company, link))
-                detail_tasks.append(asyncio.create_task(self._fetch_description(
-                    client,
-                    link,
-                    ["div.description", "section.description", "article", "main"]
-                )))
-
-            descriptions = await asyncio.gather(*detail_tasks, return_exceptions=True)
-            for (title, company, link), desc in zip(meta, descriptions):
-                description = desc if isinstance(desc, str) else "Could not fetch description."
-                results.append(JobCreate(
-                    title=title,
-                    company=company,
-                    url=link,
-                    source="RemoteOK",
-                    is_remote=True,
-                    description=description[:5000],
-                ))
-        except Exception as e:
-            logger.error("Error scraping RemoteOK: %s", e)
-        return results
-
-    async def search_jobs(self, query: str) -> List[JobCreate]:
-        clean_query = (query or "").lower().strip().replace(" ", "-")
-        if not clean_query:
-            return []
-
-        async with httpx.AsyncClient() as client:
-            tasks = [
-                self._scrape_programathor(client, clean_query),
-                self._scrape_weworkremotely(client, clean_query),
-                self._scrape_remoteok(client, clean_query),
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        aggregated: List[JobCreate] = []
+    async def _iter_sources(
+        self,
+        client: HttpClientPool,
+        clean_query: str,
+        deep: bool,
+        found: dict[str, JobCreate] | None = None,
+    ) -> AsyncIterator[JobCreate]:
+        """Merge the per-source streams, yielding each job once as soon as any source produces it."""
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+
+        async def drain(source: AsyncIterator[JobCreate]):
+            try:
+                async for job in source:
+                    await queue.put(job)
+            except Exception as e:
+                logger.error("Scraper task failed: %s", e)
+            finally:
+                await queue.put(finished)
+
+        tasks = [asyncio.create_task(drain(self._scrape_source(client, source, clean_query, deep, found))) for source in SOURCES]
         seen_urls = set()
-        for res in results:
-            if isinstance(res, Exception):
-                logger.error("Scraper task failed: %s", res)
-                continue
-            if not isinstance(res, list):
-                continue
-            for job in res:
+        remaining = len(tasks)
+        try:
+            while remaining:
+                job = await queue.get()
+                if job is finished:
+                    remaining -= 1
+                    continue
                 if job.url in seen_urls:
                     continue
                 seen_urls.add(job.url)
-                aggregated.append(job)
+                yield job
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _until_deadline(
+        self,
+        jobs: AsyncIterator[JobCreate],
+        deadline: float | None,
+        found: dict[str, JobCreate],
+    ) -> AsyncIterator[JobCreate]:
+        """Pass jobs through until `deadline` seconds have passed, then record what is left in `self.pending`."""
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + deadline if deadline else None
+        yielded: set[str] = set()
+        try:
+            while True:
+                timeout = None if expires is None else max(0.0, expires - loop.time())
+                try:
+                    job = await asyncio.wait_for(anext(jobs), timeout)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    logger.warning("Search deadline of %gs reached", deadline)
+                    break
+                yielded.add(job.url)
+                yield job
+        finally:
+            await jobs.aclose()
+            self.pending = [card for link, card in found.items() if link not in yielded]
+
+    async def iter_jobs(self, query: str, deep: bool = False, deadline: float | None = None) -> AsyncIterator[JobCreate]:
+        """Stream jobs from every source as they complete.
+
+        With a `deadline` (seconds) the stream ends when it expires; cards whose details
+        had not arrived by then, or were skipped by an open circuit, end up in `self.pending`.
+        """
+        self.pending = []
+        self.stored = {}
+        slug = clean_query(query)
+        if not slug:
+            return
+
+        found: dict[str, JobCreate] = {}
+        if self.http is not None:
+            async for job in self._until_deadline(self._iter_sources(self.http, slug, deep, found), deadline, found):
+                yield job
+        else:
+            async with HttpClientPool() as client:
+                async for job in self._until_deadline(self._iter_sources(client, slug, deep, found), deadline, found):
+                    yield job
 
-        return aggregated
+    async def search_jobs(self, query: str, deep: bool = False, deadline: float | None = None) -> List[JobCreate]:
+        return [job async for job in self.iter_jobs(query, deep, deadline)]
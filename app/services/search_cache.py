@@ -0,0 +1,82 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+from ..config import settings
+
+class SearchCoalescer:
+    """Single-flight execution plus a short-lived LRU cache of search results.
+
+    Concurrent calls with the same key share one in-flight run, and its result is
+    served to later calls for `ttl` seconds. Failed runs, and results the `cacheable`
+    predicate rejects (partial searches), are not cached, so the next call retries.
+    A caller that disconnects does not cancel the shared run.
+    """
+
+    def __init__(self, ttl: float | None = None, max_entries: int | None = None):
+        self.ttl = settings.search_cache_ttl if ttl is None else ttl
+        self.max_entries = settings.search_cache_max_entries if max_entries is None else max_entries
+        self._results: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.counters = {"hits": 0, "coalesced": 0, "runs": 0, "failures": 0}
+
+    def _cached(self, key: Hashable) -> Any:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return result
+
+    def _store(self, key: Hashable, result: Any):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        self._results[key] = (time.monotonic(), result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    async def run(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        cached = self._cached(key)
+        if cached is not None:
+            self.counters["hits"] += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.counters["coalesced"] += 1
+        else:
+            self.counters["runs"] += 1
+            task = asyncio.create_task(self._lead(key, factory, cacheable))
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _lead(self, key: Hashable, factory: Callable[[], Awaitable[Any]], cacheable: Callable[[Any], bool] | None) -> Any:
+        try:
+            result = await factory()
+        except BaseException:
+            self.counters["failures"] += 1
+            raise
+        else:
+            if cacheable is None or cacheable(result):
+                self._store(key, result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "entries": len(self._results),
+            "inflight": len(self._inflight),
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+        }
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List
+from fastapi import HTTPException
+from .. import schemas, database
+from ..config import settings
+from . import job_store, metrics, task_queue
+from .ai_analyzer import BatchScorer
+from .dedupe import NearDuplicateIndex, fingerprint, same_posting
+from .prerank import LocalRanker
+from .scraper import JobScraper
+from .url_index import KnownUrlIndex
+from .vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class SearchOutcome:
+    """What `SearchPipeline.run()` returns: the finished jobs plus whatever missed the deadline."""
+
+    jobs: List[schemas.Job]
+    pending: List[schemas.JobCreate] = field(default_factory=list)
+    task_id: int | None = None
+
+async def _score_job(job_data: schemas.JobCreate, scorer: BatchScorer):
+    if not job_data.description:
+        job_data.match_score = 0
+        job_data.match_reason = "Descrição ausente"
+        return
+    try:
+        analysis = await scorer.score(job_data.description)
+    except Exception as e:
+        logger.exception("AI scoring failed for %s: %s", job_data.url, e)
+        job_data.match_score = 0
+        job_data.match_reason = "AI Error"
+        return
+    job_data.match_score = int(analysis.get("score", 0))
+    job_data.match_reason = (analysis.get("reason", "N/A") or "N/A")[:400]
+
+class SearchPipeline:
+    """Scrape, sort out stored / near-duplicate / new postings, score the new ones and persist them.
+
+    `events()` reports progress as it happens (used by the streaming endpoint);
+    `run()` collects the same stream into the list returned by POST /jobs/search.
+
+    The whole search shares one `deadline` (seconds, `SEARCH_DEADLINE_SECONDS` by default).
+    Postings whose details or score are still missing when it expires are not stored; they
+    are reported as pending and, with `enqueue_pending`, left to a crawl task to finish.
+    """
+
+    def __init__(
+        self,
+        scraper: JobScraper,
+        url_index: KnownUrlIndex | None = None,
+        dedupe_index: NearDuplicateIndex | None = None,
+        ranker: LocalRanker | None = None,
+        vector_index: VectorIndex | None = None,
+        deadline: float | None = None,
+        enqueue_pending: bool = True,
+    ):
+        self.scraper = scraper
+        self.url_index = url_index
+        self.dedupe_index = dedupe_index
+        self.ranker = ranker
+        self.vector_index = vector_index
+        self.deadline = settings.search_deadline_seconds if deadline is None else deadline
+        self.enqueue_pending = enqueue_pending
+
+    async def events(self, query: str, deep: bool = False) -> AsyncIterator[dict]:
+        """Yield `job`, `duplicate`, `score`, `saved`, `pending`, `error` and finally `done` events."""
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + self.deadline if self.deadline > 0 else None
+        queue: asyncio.Queue = asyncio.Queue()
+        scorer = BatchScorer(query)
+        new_jobs: List[schemas.JobCreate] = []
+        fingerprints: dict[str, int] = {}
+        aliases: dict[str, int | str] = {}
+        batch_index = NearDuplicateIndex()
+        batch_jobs: dict[str, schemas.JobCreate] = {}
+        score_tasks: List[asyncio.Task] = []
+        counts = {"stored": 0, "duplicates": 0}
+        query_vector = self.ranker.query_vector(query) if self.ranker is not None else None
+
+        async def score(job_data: schemas.JobCreate):
+            # Jobs the local rules already rule out keep the local verdict and skip Gemini.
+            verdict = None
+            if self.ranker is not None and job_data.description:
+                with metrics.timed("prerank"):
+                    verdict = self.ranker.check(job_data, query, query_vector)
+            if verdict is not None and not verdict.send:
+                job_data.match_score = verdict.score
+                job_data.match_reason = verdict.reason
+            else:
+                await _score_job(job_data, scorer)
+            await queue.put({
+                "event": "score",
+                "url": job_data.url,
+                "match_score": job_data.match_score,
+                "match_reason": job_data.match_reason,
+            })
+
+        async def classify(job_data: schemas.JobCreate) -> dict:
+            # The scraper already looked up each listing page's known URLs in one query.
+            stored = self.scraper.stored.get(job_data.url)
+            if stored is None and self.scraper.url_index is None:
+                # Without the known-URL index nothing has checked this URL yet.
+                with metrics.timed("db_lookup"):
+                    stored = (await database.run_db(job_store.existing_jobs, [job_data.url])).get(job_data.url)
+            if stored is not None:
+                counts["stored"] += 1
+                return {"event": "job", "stored": True, "job": stored}
+
+            fp = fingerprint(job_data.title, job_data.company, job_data.description) if settings.dedupe_enabled else None
+            if fp is not None:
+                fingerprints[job_data.url] = fp
+                for match_id in self.dedupe_index.candidates(fp) if self.dedupe_index is not None else ():
+                    canonical = await database.run_db(job_store.get_job, match_id)
+                    if canonical is not None and same_posting(job_data.title, job_data.company, canonical.title, canonical.company):
+                        aliases[job_data.url] = canonical.id
+                        counts["duplicates"] += 1
+                        return {"event": "duplicate", "url": job_data.url, "canonical_url": canonical.url, "job": canonical}
+                for match_url in batch_index.candidates(fp):
+                    match = batch_jobs[match_url]
+                    if same_posting(job_data.title, job_data.company, match.title, match.company):
+                        aliases[job_data.url] = match_url
+                        counts["duplicates"] += 1
+                        return {"event": "duplicate", "url": job_data.url, "canonical_url": match_url}
+                batch_index.add(job_data.url, fp)
+                batch_jobs[job_data.url] = job_data
+
+            new_jobs.append(job_data)
+            if self.ranker is not None:
+                self.ranker.observe(job_data.description)
+            score_tasks.append(asyncio.create_task(score(job_data)))
+            return {"event": "job", "stored": False, "job": job_data}
+
+        async def produce():
+            try:
+                async for job_data in self.scraper.iter_jobs(query, deep, deadline=self.deadline or None):
+                    await queue.put(await classify(job_data))
+            except Exception as e:
+                logger.error("Search pipeline failed: %s", e)
+                await queue.put({"event": "error", "status": 502, "detail": f"Scraper error: {e}"})
+            finally:
+                if score_tasks:
+                    # Scores still running at the deadline are dropped; their jobs become pending.
+                    timeout = None if expires is None else max(0.0, expires - loop.time())
+                    _, late = await asyncio.wait(score_tasks, timeout=timeout)
+                    for task in late:
+                        task.cancel()
+                await queue.put(None)
+
+        await self._catch_up()
+        producer = asyncio.create_task(produce())
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+
+            scored, pending = [], []
+            for job_data, task in zip(new_jobs, score_tasks):
+                (scored if task.done() and not task.cancelled() else pending).append(job_data)
+            new_jobs = scored
+            # Copies of a posting that is not stored yet are left for the crawl task to link.
+            pending_urls = {job_data.url for job_data in pending}
+            for url in [url for url, target in aliases.items() if target in pending_urls]:
+                del aliases[url]
+            pending += self.scraper.pending
+            if pending:
+                task_id = None
+                if self.enqueue_pending:
+                    task = await database.run_db(task_queue.enqueue, query, deep, write=True)
+                    task_id = task.id
+                yield {"event": "pending", "jobs": pending, "task_id": task_id}
+
+            if new_jobs or aliases:
+                try:
+                    with metrics.timed("db_persist"):
+                        inserted, existing = await database.run_db(
+                            job_store.save_new_jobs, new_jobs, fingerprints, aliases, write=True
+                        )
+                except HTTPException as e:
+                    yield {"event": "error", "status": e.status_code, "detail": e.detail}
+                    return
+                self._remember(inserted, fingerprints, aliases)
+                if inserted and self.vector_index is not None:
+                    await database.run_db(self.vector_index.refresh)
+                yield {"event": "saved", "jobs": inserted + existing}
+            yield {
+                "event": "done",
+                "found": counts["stored"] + counts["duplicates"] + len(new_jobs),
+                "new": len(new_jobs),
+                "duplicates": counts["duplicates"],
+                "pending": len(pending),
+            }
+        finally:
+            producer.cancel()
+            for task in score_tasks:
+                task.cancel()
+
+    async def _catch_up(self):
+        # Jobs another process stored (the crawl worker, or the API for the worker) are not
+        # in this process's indexes yet; read everything above the last id they saw.
+        if self.url_index is not None:
+            with metrics.timed("db_lookup"):
+                await database.run_db(self.url_index.refresh)
+        if self.dedupe_index is not None:
+            with metrics.timed("db_lookup"):
+                await database.run_db(self.dedupe_index.refresh)
+
+    def _remember(self, inserted: List[schemas.Job], fingerprints: dict[str, int], aliases: dict[str, int | str]):
+        if self.url_index is not None:
+            self.url_index.add([job.url for job in inserted] + list(aliases))
+        if self.dedupe_index is not None:
+            for job in inserted:
+                if job.url in fingerprints:
+                    self.dedupe_index.add(job.id, fingerprints[job.url])
+
+    async def run(self, query: str, deep: bool = False) -> SearchOutcome:
+        jobs: dict[int, schemas.Job] = {}
+        outcome = SearchOutcome(jobs=[])
+        async for event in self.events(query, deep):
+            if event["event"] == "error":
+                raise HTTPException(status_code=event["status"], detail=event["detail"])
+            if event["event"] == "pending":
+                outcome.pending, outcome.task_id = event["jobs"], event["task_id"]
+            if event["event"] in ("job", "duplicate") and isinstance(event.get("job"), schemas.Job):
+                jobs.setdefault(event["job"].id, event["job"])
+            elif event["event"] == "saved":
+                for job in event["jobs"]:
+                    jobs.setdefault(job.id, job)
+        outcome.jobs = list(jobs.values())
+        return outcome
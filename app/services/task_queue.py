@@ -0,0 +1,152 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+from .. import schemas
+from ..config import settings
+from ..models import crawl as models
+from ..models import job as job_models
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = ("pending", "running")
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _claimable(now: datetime):
+    return or_(
+        and_(models.CrawlTask.status == "pending", models.CrawlTask.run_after <= now),
+        and_(models.CrawlTask.status == "running", models.CrawlTask.lease_expires_at < now),
+    )
+
+def enqueue(db: Session, query: str, deep: bool = False, saved_query_id: int | None = None) -> schemas.CrawlTask:
+    """Queue a search, or return the task already queued or running for the same query."""
+    active = (
+        db.query(models.CrawlTask)
+        .filter(models.CrawlTask.query == query, models.CrawlTask.deep == deep, models.CrawlTask.status.in_(ACTIVE))
+        .order_by(models.CrawlTask.id)
+        .first()
+    )
+    if active is not None:
+        return schemas.CrawlTask.model_validate(active)
+    task = models.CrawlTask(query=query, deep=deep, status="pending", run_after=_now(), saved_query_id=saved_query_id)
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    return schemas.CrawlTask.model_validate(task)
+
+def claim(db: Session, worker_id: str, lease_seconds: float | None = None) -> schemas.CrawlTask | None:
+    """Lease the oldest claimable task to `worker_id`.
+
+    PostgreSQL picks the candidate with FOR UPDATE SKIP LOCKED, so workers never wait on
+    each other's rows. SQLite has no row locks (the clause is omitted there) and workers
+    may pick the same candidate, so the lease is taken with a conditional UPDATE. Only
+    one worker matches it, and the others move on to the next candidate.
+    """
+    lease = timedelta(seconds=lease_seconds or settings.worker_lease_seconds)
+    for _ in range(5):
+        now = _now()
+        candidate = db.execute(
+            select(models.CrawlTask.id)
+            .where(_claimable(now))
+            .order_by(models.CrawlTask.run_after, models.CrawlTask.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).scalar()
+        if candidate is None:
+            db.rollback()
+            return None
+        claimed = db.execute(
+            update(models.CrawlTask)
+            .where(models.CrawlTask.id == candidate, _claimable(now))
+            .values(
+                status="running",
+                leased_by=worker_id,
+                lease_expires_at=now + lease,
+                attempts=models.CrawlTask.attempts + 1,
+                started_at=now,
+            )
+        ).rowcount
+        db.commit()
+        if claimed:
+            return schemas.CrawlTask.model_validate(db.get(models.CrawlTask, candidate))
+    return None
+
+def extend_lease(db: Session, task_id: int, worker_id: str, lease_seconds: float | None = None) -> bool:
+    """Push the lease forward; False means the task was reclaimed by another worker."""
+    lease = timedelta(seconds=lease_seconds or settings.worker_lease_seconds)
+    extended = db.execute(
+        update(models.CrawlTask)
+        .where(models.CrawlTask.id == task_id, models.CrawlTask.leased_by == worker_id, models.CrawlTask.status == "running")
+        .values(lease_expires_at=_now() + lease)
+    ).rowcount
+    db.commit()
+    return bool(extended)
+
+def complete(db: Session, task_id: int, worker_id: str, job_ids: List[int]) -> bool:
+    done = db.execute(
+        update(models.CrawlTask)
+        .where(models.CrawlTask.id == task_id, models.CrawlTask.leased_by == worker_id, models.CrawlTask.status == "running")
+        .values(status="done", job_ids=job_ids, error=None, lease_expires_at=None, finished_at=_now())
+    ).rowcount
+    db.commit()
+    return bool(done)
+
+def fail(db: Session, task_id: int, worker_id: str, error: str, retry_seconds: float = 60.0) -> bool:
+    """Record a failed attempt: back to pending after `retry_seconds`, or failed for good."""
+    task = db.get(models.CrawlTask, task_id)
+    if task is None or task.leased_by != worker_id or task.status != "running":
+        db.rollback()
+        return False
+    task.error = error[:1000]
+    task.lease_expires_at = None
+    if task.attempts >= settings.worker_max_attempts:
+        task.status = "failed"
+        task.finished_at = _now()
+    else:
+        task.status = "pending"
+        task.run_after = _now() + timedelta(seconds=retry_seconds * task.attempts)
+    db.commit()
+    return True
+
+def get_task(db: Session, task_id: int) -> schemas.CrawlTask | None:
+    task = db.get(models.CrawlTask, task_id)
+    if task is None:
+        return None
+    result = schemas.CrawlTask.model_validate(task)
+    if task.status == "done" and task.job_ids:
+        rows = db.query(job_models.Job).filter(job_models.Job.id.in_(task.job_ids)).order_by(job_models.Job.id.desc())
+        result.jobs = [schemas.Job.model_validate(row) for row in rows]
+    return result
+
+def enqueue_due(db: Session) -> List[schemas.CrawlTask]:
+    """Queue every enabled saved query whose interval has elapsed.
+
+    `last_enqueued_at` is advanced with a compare-and-set, so when several workers
+    run the scheduler at once each due query is queued exactly once.
+    """
+    now = _now()
+    queued = []
+    for saved in db.query(models.SavedQuery).filter(models.SavedQuery.enabled.is_(True)).all():
+        previous = saved.last_enqueued_at
+        if previous is not None:
+            if previous.tzinfo is None:
+                previous = previous.replace(tzinfo=timezone.utc)
+            if previous + timedelta(minutes=saved.interval_minutes) > now:
+                continue
+        won = db.execute(
+            update(models.SavedQuery)
+            .where(
+                models.SavedQuery.id == saved.id,
+                models.SavedQuery.last_enqueued_at.is_(None) if saved.last_enqueued_at is None
+                else models.SavedQuery.last_enqueued_at == saved.last_enqueued_at,
+            )
+            .values(last_enqueued_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        if won:
+            queued.append(enqueue(db, saved.query, saved.deep, saved.id))
+    return queued
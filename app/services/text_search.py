@@ -0,0 +1,110 @@
+import logging
+import re
+from typing import Iterable
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from ..models import job as models
+
+logger = logging.getLogger(__name__)
+
+_TERM = re.compile(r"\w+\*?", re.UNICODE)
+
+# Dialect the index was set up for ("sqlite" / "postgresql"), or None when unavailable.
+backend: str | None = None
+
+def setup(engine: Engine):
+    """Create the full-text index for the engine's dialect and backfill rows not indexed yet."""
+    global backend
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts "
+                    "USING fts5(title, description, tokenize = 'unicode61 remove_diacritics 2')"
+                ))
+                # Read through the mapped column so compressed descriptions are decoded.
+                missing = conn.execute(
+                    select(models.Job.id, models.Job.title, models.Job.description)
+                    .where(text("id NOT IN (SELECT rowid FROM jobs_fts)"))
+                ).all()
+                if missing:
+                    conn.execute(
+                        text("INSERT INTO jobs_fts (rowid, title, description) VALUES (:id, :title, :description)"),
+                        [{"id": id_, "title": title or "", "description": description or ""} for id_, title, description in missing],
+                    )
+            elif dialect == "postgresql":
+                conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)"
+                ))
+                conn.execute(text(
+                    "UPDATE jobs SET search_vector = "
+                    "setweight(to_tsvector('simple', COALESCE(title, '')), 'A') || "
+                    "setweight(to_tsvector('simple', COALESCE(description, '')), 'B') "
+                    "WHERE search_vector IS NULL"
+                ))
+            else:
+                logger.warning("Full-text search is not supported on %s", dialect)
+                return
+    except DBAPIError as e:
+        logger.warning("Full-text search disabled: %s", e)
+        return
+    backend = dialect
+
+def index_jobs(db: Session, jobs: Iterable[models.Job]):
+    """Add freshly inserted (flushed) jobs to the index inside the caller's transaction."""
+    rows = [{"id": job.id, "title": job.title or "", "description": job.description or ""} for job in jobs]
+    if not rows or backend is None:
+        return
+    if backend == "sqlite":
+        db.execute(
+            text("INSERT OR REPLACE INTO jobs_fts (rowid, title, description) VALUES (:id, :title, :description)"),
+            rows,
+        )
+    else:
+        db.execute(
+            text(
+                "UPDATE jobs SET search_vector = "
+                "setweight(to_tsvector('simple', :title), 'A') || "
+                "setweight(to_tsvector('simple', :description), 'B') "
+                "WHERE id = :id"
+            ),
+            rows,
+        )
+
+def _terms(query: str) -> list[tuple[str, bool]]:
+    """Split a user query into (term, is_prefix) pairs; `pyth*` asks for a prefix match."""
+    return [(term.rstrip("*"), term.endswith("*")) for term in _TERM.findall(query or "") if term.rstrip("*")]
+
+def search(db: Session, query: str, limit: int = 20) -> list[models.Job]:
+    """Return jobs matching every term of `query`, best ranked first."""
+    terms = _terms(query)
+    if not terms or backend is None:
+        return []
+    if backend == "sqlite":
+        match = " ".join(f'"{term}"*' if prefix else f'"{term}"' for term, prefix in terms)
+        rows = db.execute(
+            text(
+                "SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH :match "
+                "ORDER BY bm25(jobs_fts, 10.0, 1.0) LIMIT :limit"
+            ),
+            {"match": match, "limit": limit},
+        ).all()
+    else:
+        tsquery = " & ".join(f"{term}:*" if prefix else term for term, prefix in terms)
+        rows = db.execute(
+            text(
+                "SELECT id FROM jobs WHERE search_vector @@ to_tsquery('simple', :tsquery) "
+                "ORDER BY ts_rank_cd(search_vector, to_tsquery('simple', :tsquery)) DESC, id DESC "
+                "LIMIT :limit"
+            ),
+            {"tsquery": tsquery, "limit": limit},
+        ).all()
+    ids = [row[0] for row in rows]
+    if not ids:
+        return []
+    by_id = {job.id: job for job in db.query(models.Job).filter(models.Job.id.in_(ids))}
+    return [by_id[job_id] for job_id in ids if job_id in by_id]
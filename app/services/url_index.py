@@ -0,0 +1,122 @@
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+from typing import Callable, Iterable
+from sqlalchemy.orm import Session
+from .. import database, schemas
+from ..config import settings
+from ..models import job as models
+from . import job_store
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+class KnownUrlIndex:
+    """Bloom-filtered view of the URLs already stored in `jobs` or recorded as aliases.
+
+    Bloom negatives are trusted outright; positives are confirmed against the
+    database so a false positive never hides a new posting. `refresh` picks up
+    rows stored by another process (the crawl worker or the API) since the last look.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], capacity: int | None = None, error_rate: float | None = None):
+        self.session_factory = session_factory
+        self.bloom = BloomFilter(
+            capacity or settings.url_index_capacity,
+            error_rate or settings.url_index_error_rate,
+        )
+        self.counters = {"checked": 0, "bloom_negatives": 0, "confirmed": 0, "false_positives": 0}
+        # Highest id read so far per table; `refresh` continues from there.
+        self.max_ids = {models.Job: 0, models.JobAlias: 0}
+        self._lock = threading.Lock()
+
+    def warm(self):
+        db = self.session_factory()
+        try:
+            self.refresh(db)
+        finally:
+            db.close()
+
+    def refresh(self, db: Session, batch_size: int = 5000) -> int:
+        """Add the URLs of jobs and aliases stored since the last refresh; returns how many were new.
+
+        Rows are read in id batches without the lock, which is only taken to merge a batch.
+        """
+        added = 0
+        for model in (models.Job, models.JobAlias):
+            last_id = database.rescan_floor(db, self.max_ids[model])
+            while True:
+                rows = db.query(model.id, model.url).filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+                if not rows:
+                    break
+                with self._lock:
+                    for _, url in rows:
+                        if url not in self.bloom:
+                            self.bloom.add(url)
+                            added += 1
+                    self.max_ids[model] = max(self.max_ids[model], rows[-1][0])
+                last_id = rows[-1][0]
+        if added and self.bloom.count > self.bloom.capacity:
+            logger.warning("Known-URL index holds %d URLs, above its capacity of %d", self.bloom.count, self.bloom.capacity)
+        return added
+
+    def add(self, urls: Iterable[str]):
+        with self._lock:
+            for url in urls:
+                self.bloom.add(url)
+
+    def _confirm(self, urls: list[str]) -> dict[str, schemas.Job]:
+        db = self.session_factory()
+        try:
+            return job_store.existing_jobs(db, urls)
+        finally:
+            db.close()
+
+    async def lookup(self, urls: list[str]) -> dict[str, schemas.Job]:
+        """Map each of `urls` already stored in the database (directly or as an alias) to its job.
+
+        The confirmation query returns the stored rows, so callers need no second lookup.
+        """
+        candidates = [url for url in urls if url in self.bloom]
+        self.counters["checked"] += len(urls)
+        self.counters["bloom_negatives"] += len(urls) - len(candidates)
+        if not candidates:
+            return {}
+        known = await asyncio.to_thread(self._confirm, candidates)
+        self.counters["confirmed"] += len(known)
+        self.counters["false_positives"] += len(candidates) - len(known)
+        return known
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "urls": self.bloom.count,
+            "capacity": self.bloom.capacity,
+            "bits": self.bloom.size,
+            "hash_count": self.bloom.hash_count,
+        }
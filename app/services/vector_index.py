@@ -0,0 +1,376 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from typing import Callable, Iterable, Protocol
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from .. import database
+from ..config import settings
+from ..models import job as models
+from .prerank import _terms
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per matrix product, so a batch of queries never materializes a
+# (queries x all rows) score matrix.
+_CHUNK_ROWS = 65536
+
+class Embedder(Protocol):
+    """Turns texts into L2-normalized float32 rows of width `dim`.
+
+    `fit` sees a sample of the stored corpus when the index is first built, and
+    `state`/`load` persist whatever it learned next to the vectors. A model-backed
+    embedder only has to implement these and be registered in `EMBEDDERS`.
+    """
+
+    name: str
+    dim: int
+
+    def fit(self, texts: list[str]): ...
+
+    def embed(self, texts: list[str]) -> np.ndarray: ...
+
+    def state(self) -> dict[str, np.ndarray]: ...
+
+    def load(self, state: dict[str, np.ndarray]): ...
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+class HashingEmbedder:
+    """Signed feature hashing of folded terms into `dim` dimensions, with sublinear counts.
+
+    Nothing is learned, so a stored row never goes stale as the corpus grows.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _counts(self, text: str) -> np.ndarray:
+        row = np.zeros(self.dim, dtype=np.float32)
+        hashes = np.fromiter((zlib.crc32(term.encode("utf-8")) for term in _terms(text)), dtype=np.uint32)
+        if hashes.size:
+            # The top hash bit picks the sign, so colliding terms tend to cancel out.
+            signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+            np.add.at(row, (hashes % self.dim).astype(np.int64), signs)
+        return np.sign(row) * np.log1p(np.abs(row))
+
+    def fit(self, texts: list[str]):
+        pass
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return _normalize(np.vstack([self._counts(text) for text in texts]))
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {}
+
+    def load(self, state: dict[str, np.ndarray]):
+        pass
+
+class TfidfEmbedder(HashingEmbedder):
+    """Hashing vectors reweighted by an IDF per dimension, fitted once on the stored corpus.
+
+    Refitting would change every stored row, so the IDF is kept with the index and
+    only recomputed when the index is rebuilt from scratch.
+    """
+
+    name = "tfidf"
+
+    def __init__(self, dim: int):
+        super().__init__(dim)
+        self.idf = np.ones(dim, dtype=np.float32)
+
+    def fit(self, texts: list[str]):
+        if not texts:
+            return
+        df = np.zeros(self.dim, dtype=np.float32)
+        for text in texts:
+            df += self._counts(text) != 0
+        self.idf = (np.log((1 + len(texts)) / (1 + df)) + 1.0).astype(np.float32)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return _normalize(np.vstack([self._counts(text) for text in texts]) * self.idf)
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {"idf": self.idf}
+
+    def load(self, state: dict[str, np.ndarray]):
+        if "idf" in state:
+            self.idf = state["idf"].astype(np.float32)
+
+EMBEDDERS: dict[str, Callable[[int], Embedder]] = {
+    "hashing": HashingEmbedder,
+    "tfidf": TfidfEmbedder,
+}
+
+def _database_key() -> str:
+    """Identify the database without writing its URL (and credentials) to disk."""
+    return hashlib.blake2b(settings.database_url.encode("utf-8"), digest_size=8).hexdigest()
+
+def _job_text(title: str | None, description: str | None) -> str:
+    return f"{title or ''} {description or ''}"
+
+class VectorIndex:
+    """Cosine-similarity index over stored jobs (title + description).
+
+    Vectors live in one float32 matrix, grown by doubling; with a `path` the matrix
+    and its job ids are memory-mapped `.npy` files, so a restart only embeds the jobs
+    stored since the last run. `refresh` appends every job above the highest indexed
+    id, which also picks up jobs stored by other processes (the crawl worker), plus
+    jobs that committed late within `index_rescan_window` ids, so rows are in id order
+    apart from those. A saved index is only reused when it still matches
+    the database: same URL, and the jobs up to its highest id are exactly the indexed
+    ones; otherwise it is rebuilt. Searches score the matrix in chunks and keep the
+    top `k` per query with `argpartition`, many queries at a time.
+    """
+
+    def __init__(self, embedder: Embedder | None = None, path: str | None = None):
+        self.embedder = embedder or EMBEDDERS[settings.vector_index_embedder](settings.vector_index_dim)
+        self.path = settings.vector_index_path if path is None else path
+        self.size = 0
+        self.max_id = 0
+        self.vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.fitted = False
+        # Loaded from disk and not yet checked against the database by `refresh`.
+        self._unverified = False
+        self.counters = {"added": 0, "searches": 0, "queries": 0}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        if self.path:
+            self._load()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _load(self):
+        try:
+            with open(self._file("meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        if meta.get("embedder") != self.embedder.name or meta.get("dim") != self.embedder.dim:
+            logger.info("Vector index at %s was built with another embedder; rebuilding", self.path)
+            return
+        try:
+            vectors = np.load(self._file("vectors.npy"), mmap_mode="r+")
+            ids = np.load(self._file("ids.npy"), mmap_mode="r+")
+            with np.load(self._file("embedder.npz")) as state:
+                self.embedder.load(dict(state))
+        except (OSError, ValueError) as e:
+            logger.warning("Could not open the vector index at %s (%s); rebuilding", self.path, e)
+            return
+        size = min(int(meta["size"]), len(vectors), len(ids))
+        self.vectors, self.ids, self.size = vectors, ids, size
+        self.max_id = int(ids[:size].max()) if size else 0
+        self.fitted = True
+        self._loaded_database = meta.get("database")
+        self._unverified = True
+
+    def _matches_database(self, db: Session) -> bool:
+        if self._loaded_database != _database_key():
+            return False
+        if not self.size:
+            return True
+        low, high, count = (
+            db.query(func.min(models.Job.id), func.max(models.Job.id), func.count(models.Job.id))
+            .filter(models.Job.id <= self.max_id)
+            .one()
+        )
+        return (low, high, count) == (int(self.ids[:self.size].min()), self.max_id, self.size)
+
+    def _reset(self):
+        with self._lock:
+            self.size = 0
+            self.max_id = 0
+            self.vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+            self.ids = np.zeros(0, dtype=np.int64)
+            self.fitted = False
+
+    def _save_meta(self):
+        if isinstance(self.vectors, np.memmap):
+            self.vectors.flush()
+            self.ids.flush()
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({
+                "embedder": self.embedder.name,
+                "dim": self.embedder.dim,
+                "size": self.size,
+                "database": _database_key(),
+            }, f)
+        os.replace(tmp, self._file("meta.json"))
+
+    def _grown(self, array: np.ndarray, capacity: int, name: str) -> np.ndarray:
+        shape = (capacity, *array.shape[1:])
+        if not self.path:
+            grown = np.zeros(shape, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            return grown
+        tmp = self._file(f"{name}.tmp")
+        grown = np.lib.format.open_memmap(tmp, mode="w+", dtype=array.dtype, shape=shape)
+        grown[:self.size] = array[:self.size]
+        grown.flush()
+        os.replace(tmp, self._file(name))
+        return grown
+
+    def _reserve(self, rows: int):
+        if self.size + rows <= len(self.ids):
+            return
+        capacity = max(1024, 2 * len(self.ids), self.size + rows)
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+        # Searches read `size` before the arrays, and both copies hold the first `size` rows.
+        self.vectors = self._grown(self.vectors, capacity, "vectors.npy")
+        self.ids = self._grown(self.ids, capacity, "ids.npy")
+
+    def add(self, job_ids: list[int], texts: list[str]):
+        """Append jobs not indexed yet; `refresh` is the usual caller."""
+        if not job_ids:
+            return
+        rows = self.embedder.embed(texts)
+        with self._lock:
+            self._reserve(len(job_ids))
+            self.vectors[self.size:self.size + len(job_ids)] = rows
+            self.ids[self.size:self.size + len(job_ids)] = job_ids
+            self.size += len(job_ids)
+            self.max_id = max(self.max_id, max(job_ids))
+            self.counters["added"] += len(job_ids)
+            if self.path:
+                self._save_meta()
+
+    def _fit(self, db: Session, limit: int = 20000):
+        rows = (
+            db.query(models.Job.title, models.Job.description)
+            .order_by(models.Job.id.desc())
+            .limit(limit)
+            .all()
+        )
+        self.embedder.fit([_job_text(title, description) for title, description in rows])
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+            np.savez(self._file("embedder.npz"), **self.embedder.state())
+        self.fitted = True
+
+    def refresh(self, db: Session, batch_size: int = 1000) -> int:
+        """Embed every stored job above the highest indexed id; returns how many were added."""
+        added = 0
+        with self._refresh_lock:
+            if self._unverified:
+                if not self._matches_database(db):
+                    logger.info("Vector index at %s does not match the database; rebuilding", self.path)
+                    self._reset()
+                self._unverified = False
+            if not self.fitted:
+                self._fit(db)
+            added += self._add_late(db)
+            while True:
+                rows = (
+                    db.query(models.Job.id, models.Job.title, models.Job.description)
+                    .filter(models.Job.id > self.max_id)
+                    .order_by(models.Job.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    return added
+                self.add([job_id for job_id, _, _ in rows], [_job_text(title, description) for _, title, description in rows])
+                added += len(rows)
+
+    def _add_late(self, db: Session) -> int:
+        """Embed jobs at or below `max_id` that committed after the last refresh read past them."""
+        floor = database.rescan_floor(db, self.max_id)
+        if floor >= self.max_id:
+            return 0
+        ids = self.ids[:self.size]
+        indexed = set(ids[ids > floor].tolist())
+        window = db.query(models.Job.id).filter(models.Job.id > floor, models.Job.id <= self.max_id)
+        late = [job_id for (job_id,) in window if job_id not in indexed]
+        if not late:
+            return 0
+        rows = db.query(models.Job.id, models.Job.title, models.Job.description).filter(models.Job.id.in_(late)).all()
+        self.add([job_id for job_id, _, _ in rows], [_job_text(title, description) for _, title, description in rows])
+        return len(rows)
+
+    def warm(self, session_factory: Callable[[], Session]):
+        db = session_factory()
+        try:
+            added = self.refresh(db)
+        finally:
+            db.close()
+        logger.info("Vector index holds %d jobs (%d embedded at startup)", self.size, added)
+
+    def search(self, queries: np.ndarray, k: int = 10, exclude: Iterable[int] = ()) -> list[list[tuple[int, float]]]:
+        """Top `k` (job id, cosine similarity) per query row, best first."""
+        size = self.size
+        vectors, ids = self.vectors, self.ids
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        self.counters["searches"] += 1
+        self.counters["queries"] += len(queries)
+        exclude = set(exclude)
+        keep = min(k + len(exclude), size)
+        if not keep or not len(queries):
+            return [[] for _ in queries]
+
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, size, _CHUNK_ROWS):
+            scores = queries @ vectors[start:min(start + _CHUNK_ROWS, size)].T
+            top = min(keep, scores.shape[1])
+            rows = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, rows, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, rows + start], axis=1)
+            if best_scores.shape[1] > keep:
+                pick = np.argpartition(-best_scores, keep - 1, axis=1)[:, :keep]
+                best_scores = np.take_along_axis(best_scores, pick, axis=1)
+                best_rows = np.take_along_axis(best_rows, pick, axis=1)
+
+        results = []
+        for scores, rows in zip(best_scores, best_rows):
+            ranked = [(int(ids[row]), float(score)) for score, row in sorted(zip(scores, rows), key=lambda pair: -pair[0])]
+            results.append([(job_id, score) for job_id, score in ranked if job_id not in exclude][:k])
+        return results
+
+    def similar(self, job_id: int, k: int = 10) -> list[tuple[int, float]] | None:
+        """Jobs closest to a stored job, or None when `job_id` is not indexed."""
+        size = self.size
+        ids = self.ids[:size]
+        row = int(np.searchsorted(ids, job_id))
+        if row >= size or ids[row] != job_id:
+            # Ids are ascending except for rows that committed late (see `refresh`).
+            late = np.flatnonzero(ids == job_id)
+            if not len(late):
+                return None
+            row = int(late[0])
+        return self.search(self.vectors[row], k, exclude=[job_id])[0]
+
+    def match(self, texts: list[str], k: int = 10) -> list[list[tuple[int, float]]]:
+        """Rank the stored jobs against free-text queries (one result list per text)."""
+        return self.search(self.embedder.embed(texts), k)
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "size": self.size,
+            "capacity": len(self.ids),
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "memory_mapped": isinstance(self.vectors, np.memmap),
+            "bytes": self.size * self.embedder.dim * self.vectors.itemsize,
+        }
+
+    def close(self):
+        with self._lock:
+            if self.path and self.size:
+                self._save_meta()
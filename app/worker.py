@@ -0,0 +1,148 @@
+"""Background crawl worker.
+
+Queues due saved queries, then leases tasks from the `crawl_tasks` table and
+runs each one through the same search pipeline as `POST /jobs/search`
+(scrape, pre-rank, Gemini scoring, persist). Start as many workers as needed,
+on one machine or several that share the database::
+
+    python -m app.worker                  # run until stopped
+    python -m app.worker --once           # drain the queue and exit
+    python -m app.worker --concurrency 2  # two tasks at a time
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from .config import settings
+from .database import SessionLocal, engine, init_db, run_db, shutdown_executors
+from .models import crawl  # noqa: F401  (registers the queue tables before init_db)
+from . import schemas
+from .services import parsing, task_queue, text_search
+from .services.circuit_breaker import CircuitBreakers
+from .services.dedupe import NearDuplicateIndex
+from .services.http_cache import HttpCache
+from .services.http_client import HttpClientPool
+from .services.prerank import LocalRanker
+from .services.scraper import JobScraper
+from .services.search_pipeline import SearchPipeline
+from .services.url_index import KnownUrlIndex
+
+logger = logging.getLogger(__name__)
+
+class CrawlWorker:
+    def __init__(self, worker_id: str | None = None, concurrency: int | None = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.concurrency = max(1, concurrency or settings.worker_concurrency)
+        self._running: set[asyncio.Task] = set()
+
+    async def start(self):
+        self.http_pool = HttpClientPool()
+        self.http_cache = HttpCache() if settings.http_cache_enabled else None
+        self.url_index = KnownUrlIndex(SessionLocal)
+        self.breakers = CircuitBreakers()
+        await asyncio.to_thread(self.url_index.warm)
+        self.dedupe_index = NearDuplicateIndex() if settings.dedupe_enabled else None
+        if self.dedupe_index is not None:
+            await asyncio.to_thread(self.dedupe_index.warm, SessionLocal)
+        self.ranker = LocalRanker() if settings.prerank_enabled else None
+        if self.ranker is not None:
+            await asyncio.to_thread(self.ranker.warm, SessionLocal)
+
+    async def close(self):
+        for task in self._running:
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+        await self.http_pool.aclose()
+        parsing.shutdown_executor()
+        shutdown_executors()
+        if self.http_cache is not None:
+            self.http_cache.close()
+
+    def _pipeline(self) -> SearchPipeline:
+        scraper = JobScraper(http=self.http_pool, cache=self.http_cache, url_index=self.url_index, breakers=self.breakers)
+        # Tasks have no caller waiting on them: no deadline, and nothing to hand back to the queue.
+        return SearchPipeline(
+            scraper,
+            url_index=self.url_index,
+            dedupe_index=self.dedupe_index,
+            ranker=self.ranker,
+            deadline=0,
+            enqueue_pending=False,
+        )
+
+    async def _keep_lease(self, task_id: int):
+        while True:
+            await asyncio.sleep(settings.worker_lease_seconds / 3)
+            if not await run_db(task_queue.extend_lease, task_id, self.worker_id, write=True):
+                logger.warning("Lost the lease on task %d", task_id)
+                return
+
+    async def run_task(self, task: schemas.CrawlTask):
+        logger.info("Running task %d (%r, deep=%s, attempt %d)", task.id, task.query, task.deep, task.attempts)
+        heartbeat = asyncio.create_task(self._keep_lease(task.id))
+        try:
+            outcome = await self._pipeline().run(task.query, task.deep)
+        except Exception as e:
+            logger.error("Task %d failed: %s", task.id, e)
+            detail = getattr(e, "detail", None) or str(e)
+            await run_db(task_queue.fail, task.id, self.worker_id, str(detail), settings.worker_retry_seconds, write=True)
+        else:
+            await run_db(task_queue.complete, task.id, self.worker_id, [job.id for job in outcome.jobs], write=True)
+            logger.info("Task %d done: %d jobs, %d pending", task.id, len(outcome.jobs), len(outcome.pending))
+        finally:
+            heartbeat.cancel()
+
+    async def _claim_available(self) -> int:
+        claimed = 0
+        while len(self._running) < self.concurrency:
+            task = await run_db(task_queue.claim, self.worker_id, write=True)
+            if task is None:
+                break
+            running = asyncio.create_task(self.run_task(task))
+            self._running.add(running)
+            running.add_done_callback(self._running.discard)
+            claimed += 1
+        return claimed
+
+    async def run(self, once: bool = False):
+        logger.info("Worker %s started (concurrency %d)", self.worker_id, self.concurrency)
+        while True:
+            queued = await run_db(task_queue.enqueue_due, write=True)
+            if queued:
+                logger.info("Queued %d saved queries", len(queued))
+            claimed = await self._claim_available()
+            if once and not claimed and not self._running:
+                return
+            if claimed:
+                continue
+            if self._running:
+                # Wake up as soon as a slot frees, or at the next poll to pick up new work.
+                await asyncio.wait(self._running, timeout=settings.worker_poll_seconds, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                await asyncio.sleep(settings.worker_poll_seconds)
+
+async def _main(once: bool, concurrency: int | None):
+    worker = CrawlWorker(concurrency=concurrency)
+    await worker.start()
+    try:
+        await worker.run(once=once)
+    finally:
+        await worker.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="exit when no task is left")
+    parser.add_argument("--concurrency", type=int, help="tasks run at the same time (WORKER_CONCURRENCY)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    init_db()
+    text_search.setup(engine)
+    try:
+        asyncio.run(_main(args.once, args.concurrency))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Micro-benchmark for the HTML parsing stage.
+
+Compares the original parser setup (full ``html.parser`` tree) against the
+targeted parse functions in ``app.services.parsing`` on saved pages, one per
+source and page kind. Pages are read from ``<source>_<kind>.html`` files.
+``benchmarks/fixtures`` ships pages synthesized with each board's markup by
+``benchmarks.standin``, so the default run is offline and repeatable::
+
+    python -m benchmarks.parse_bench                      # uses benchmarks/fixtures
+    python -m benchmarks.parse_bench --generate           # rewrite the shipped pages
+    python -m benchmarks.parse_bench --record python --pages /tmp/pages  # live pages
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+import httpx
+from bs4 import BeautifulSoup
+from app.services import parsing
+from benchmarks import standin
+
+PAGES_DIR = Path(__file__).parent / "fixtures"
+
+SOURCES = {
+    "programathor": {
+        "listing_url": "https://programathor.com.br/jobs-{query}",
+        "card_selector": ".cell-list",
+        "parse_cards": parsing.parse_programathor_cards,
+        "base": "https://programathor.com.br",
+        "detail_selectors": [".line-height-2-4", "article", "body"],
+    },
+    "weworkremotely": {
+        "listing_url": "https://weworkremotely.com/remote-jobs/search?term={query}",
+        "card_selector": "section.jobs li.feature, section.jobs li.job",
+        "parse_cards": parsing.parse_weworkremotely_cards,
+        "base": "https://weworkremotely.com",
+        "detail_selectors": ["div.listing-container", "div#job-listing", "article", "main"],
+    },
+    "remoteok": {
+        "listing_url": "https://remoteok.com/remote-{query}-jobs",
+        "card_selector": "tr.job",
+        "parse_cards": parsing.parse_remoteok_cards,
+        "base": "https://remoteok.com",
+        "detail_selectors": ["div.description", "section.description", "article", "main"],
+    },
+}
+
+def _baseline_listing(html: bytes, spec: dict):
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.select(spec["card_selector"])
+
+def _baseline_detail(html: bytes, spec: dict):
+    soup = BeautifulSoup(html, "html.parser")
+    for selector in spec["detail_selectors"]:
+        node = soup.select_one(selector)
+        if node and node.get_text(" ", strip=True):
+            return node.get_text(" ", strip=True)[:5000]
+    return soup.get_text(" ", strip=True)[:5000]
+
+def _timeit(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+def record(query: str, pages_dir: Path):
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; VagaHunter/1.0; +https://github.com/)"}
+    with httpx.Client(headers=headers, follow_redirects=True, timeout=15) as client:
+        for name, spec in SOURCES.items():
+            listing = client.get(spec["listing_url"].format(query=query)).content
+            (pages_dir / f"{name}_listing.html").write_bytes(listing)
+            cards = spec["parse_cards"](listing, 1, "html.parser")
+            if not cards:
+                print(f"{name}: no cards found, detail page not recorded")
+                continue
+            href = cards[0][2]
+            detail_url = href if href.startswith("http") else f"{spec['base']}{href}"
+            (pages_dir / f"{name}_detail.html").write_bytes(client.get(detail_url).content)
+            print(f"{name}: recorded listing and {detail_url}")
+
+def generate(pages_dir: Path, query: str = "python"):
+    """Write one stand-in listing and detail page per source (same output on every run)."""
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    listings = {
+        "programathor": standin.programathor_listing(query, 1, 1),
+        "weworkremotely": standin.weworkremotely_listing(query, 1, 1),
+        "remoteok": standin.remoteok_listing(query, 0, 1),
+    }
+    for name, listing in listings.items():
+        (pages_dir / f"{name}_listing.html").write_text(listing, encoding="utf-8")
+        href = SOURCES[name]["parse_cards"](listing.encode("utf-8"), 1, "html.parser")[0][2]
+        (pages_dir / f"{name}_detail.html").write_text(standin.detail_page(name, href, query), encoding="utf-8")
+        print(f"{name}: generated listing and {href}")
+
+def run(pages_dir: Path, repeat: int):
+    backend = parsing.html_parser()
+    print(f"{'page':<28}{'size':>9}{'baseline ms':>14}{'targeted ms':>14}{backend + ' ms':>14}{'speedup':>10}")
+    for name, spec in SOURCES.items():
+        for kind in ("listing", "detail"):
+            path = pages_dir / f"{name}_{kind}.html"
+            if not path.exists():
+                continue
+            html = path.read_bytes()
+            if kind == "listing":
+                baseline = lambda: _baseline_listing(html, spec)
+                targeted = lambda parser: spec["parse_cards"](html, 10_000, parser)
+            else:
+                baseline = lambda: _baseline_detail(html, spec)
+                targeted = lambda parser: parsing.extract_description(html, spec["detail_selectors"], parser)
+            base_ms = _timeit(baseline, repeat)
+            stdlib_ms = _timeit(lambda: targeted("html.parser"), repeat)
+            fast_ms = _timeit(lambda: targeted(backend), repeat)
+            print(
+                f"{path.name:<28}{len(html) // 1024:>7}KB{base_ms:>14.2f}{stdlib_ms:>14.2f}"
+                f"{fast_ms:>14.2f}{base_ms / fast_ms:>9.1f}x"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=Path, default=PAGES_DIR, help="directory with saved pages")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--record", metavar="QUERY", help="download live pages for QUERY before benchmarking")
+    parser.add_argument("--generate", action="store_true", help="write stand-in pages before benchmarking")
+    args = parser.parse_args()
+    if args.record:
+        record(args.record, args.pages)
+    elif args.generate or not any(args.pages.glob("*.html")):
+        generate(args.pages)
+    run(args.pages, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Offline load benchmark for the scrape, score and persist pipeline.
+
+The three job boards are served by ``benchmarks.standin.StandInBoards`` and
+Gemini by ``benchmarks.standin.FakeGenai``, so no network access is needed.
+Each scenario sends ``--requests`` calls at ``--concurrency`` and reports
+p50/p95/p99 latency and throughput::
+
+    python -m benchmarks.pipeline_bench                              # every scenario
+    python -m benchmarks.pipeline_bench --scenario search --concurrency 8 --deep
+    python -m benchmarks.pipeline_bench --board-latency 0.3 --error-rate 0.05
+    python -m benchmarks.pipeline_bench --pages benchmarks/fixtures  # saved pages
+
+The run uses a throwaway SQLite database and vector index, no HTTP cache and
+no search result cache unless ``DATABASE_URL``, ``VECTOR_INDEX_PATH``,
+``HTTP_CACHE_ENABLED`` or ``SEARCH_CACHE_TTL`` are set. ``SCRAPER_SLEEP_SECONDS`` defaults to 0 so the per-host rate limits
+do not dominate the numbers.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+_WORKDIR = tempfile.mkdtemp(prefix="vagahunter-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_WORKDIR}/bench.db")
+os.environ.setdefault("HTTP_CACHE_ENABLED", "false")
+os.environ.setdefault("SEARCH_CACHE_TTL", "0")
+os.environ.setdefault("SCRAPER_SLEEP_SECONDS", "0")
+os.environ.setdefault("VECTOR_INDEX_PATH", f"{_WORKDIR}/vector_index")
+
+import httpx  # noqa: E402
+from app.services import ai_analyzer  # noqa: E402
+from app.services.http_client import HttpClientPool  # noqa: E402
+from app.services.scraper import JobScraper  # noqa: E402
+from benchmarks.standin import FakeGenai, StandInBoards  # noqa: E402
+
+SCENARIOS = ("scraper", "search", "list")
+DEFAULT_QUERIES = "python,java,golang,react,node,kotlin,ruby,php,rust,scala"
+
+def _percentile(samples: list[float], pct: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+async def _drive(name: str, call, requests: int, concurrency: int) -> dict:
+    """Run `call(i)` `requests` times with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception as e:
+                errors += 1
+                print(f"{name}: request {i} failed: {e!r}")
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "scenario": name,
+        "requests": requests,
+        "errors": errors,
+        "p50": _percentile(latencies, 50) * 1000,
+        "p95": _percentile(latencies, 95) * 1000,
+        "p99": _percentile(latencies, 99) * 1000,
+        "throughput": requests / elapsed,
+    }
+
+async def bench_scraper(boards: StandInBoards, queries: list[str], args) -> dict:
+    async with HttpClientPool(transport=boards.transport()) as pool:
+        scraper = JobScraper(http=pool)
+
+        async def call(i: int):
+            await scraper.search_jobs(queries[i % len(queries)], args.deep)
+
+        return await _drive("scraper", call, args.requests, args.concurrency)
+
+async def bench_api(boards: StandInBoards, queries: list[str], args, scenarios: list[str]) -> list[dict]:
+    from app.main import app
+
+    results = []
+    async with app.router.lifespan_context(app):
+        await app.state.http_pool.aclose()
+        app.state.http_pool = HttpClientPool(transport=boards.transport())
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            async def search(i: int):
+                response = await client.post("/jobs/search", params={"query": queries[i % len(queries)], "deep": args.deep})
+                response.raise_for_status()
+
+            async def list_jobs(i: int):
+                params = {"limit": 100, "order": "score" if i % 2 else "recent"}
+                response = await client.get("/jobs", params=params)
+                response.raise_for_status()
+
+            if "search" in scenarios:
+                results.append(await _drive("search", search, args.requests, args.concurrency))
+            if "list" in scenarios:
+                if "search" not in scenarios:
+                    # GET /jobs needs rows to page through.
+                    await asyncio.gather(*(search(i) for i in range(len(queries))))
+                results.append(await _drive("list", list_jobs, args.requests * 10, args.concurrency))
+    return results
+
+def report(results: list[dict], boards: StandInBoards, genai: FakeGenai):
+    print(f"{'scenario':<10}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for r in results:
+        print(
+            f"{r['scenario']:<10}{r['requests']:>10}{r['errors']:>8}{r['p50']:>10.1f}"
+            f"{r['p95']:>10.1f}{r['p99']:>10.1f}{r['throughput']:>10.2f}"
+        )
+    board = boards.counters
+    print(
+        f"\nboards: {board['requests']} requests, {board['bytes'] // 1024} KB, "
+        f"{board['errors']} injected 503s, {board['timeouts']} injected timeouts"
+    )
+    ai = genai.counters
+    print(f"gemini: {ai['calls']} calls ({ai['batch_calls']} batched), {ai['jobs']} jobs scored, ~{ai['prompt_tokens']} prompt tokens")
+
+async def run(args):
+    boards = StandInBoards(
+        latency=args.board_latency,
+        jitter=args.board_latency / 3,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        pages=args.listing_pages,
+        recorded=args.pages,
+        seed=args.seed,
+    )
+    genai = FakeGenai(latency=args.ai_latency, jitter=args.ai_latency / 4, seed=args.seed)
+    ai_analyzer.client = genai
+    if not args.ai_cache:
+        ai_analyzer.score_cache = None
+    queries = [q.strip() for q in args.queries.split(",") if q.strip()]
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+
+    results = []
+    if "scraper" in scenarios:
+        results.append(await bench_scraper(boards, queries, args))
+    api_scenarios = [s for s in scenarios if s != "scraper"]
+    if api_scenarios:
+        results.extend(await bench_api(boards, queries, args, api_scenarios))
+    report(results, boards, genai)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--requests", type=int, default=20, help="calls per scenario (GET /jobs sends 10x)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--queries", default=DEFAULT_QUERIES, help="comma-separated queries, used round-robin")
+    parser.add_argument("--deep", action="store_true", help="crawl every listing page")
+    parser.add_argument("--listing-pages", type=int, default=3, help="listing pages per source and query")
+    parser.add_argument("--board-latency", type=float, default=0.05, help="mean board response time in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of board responses that are 503s")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="share of board requests that time out")
+    parser.add_argument("--ai-latency", type=float, default=0.8, help="mean fake Gemini response time in seconds")
+    parser.add_argument("--ai-cache", action="store_true", help="keep the persistent AI score cache enabled")
+    parser.add_argument("--pages", type=Path, help="serve recorded <source>_<kind>.html pages from this directory")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Offline stand-ins for the job boards and for Gemini, used by the benchmarks.
+
+``StandInBoards`` answers every Programathor, WeWorkRemotely and RemoteOK URL
+the scraper asks for through an ``httpx.MockTransport``, with configurable
+latency, 503s and timeouts. Listing and detail pages are synthesized with each
+board's markup (deterministic per URL), or taken from recorded
+``<source>_<kind>.html`` files such as the ones ``parse_bench --record`` saves.
+
+``FakeGenai`` mimics the part of ``google.genai.Client`` that
+``app.services.ai_analyzer`` uses and answers single and batch prompts with
+well-formed JSON after a configurable delay.
+"""
+import asyncio
+import json
+import random
+import re
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+import httpx
+
+WORDS = (
+    "python django fastapi flask postgres docker kubernetes aws gcp java spring kotlin go node react "
+    "typescript sql redis celery kafka api rest graphql testes ci cd git linux equipe produto dados "
+    "clientes desenvolvimento sistemas benefícios remoto flexível plano saúde vale refeição home office"
+).split()
+TITLES = ("Desenvolvedor {q}", "Backend {q} Developer", "Engenheiro de Software {q}", "{q} Engineer")
+LEVELS = ("Júnior", "Pleno", "Sênior", "")
+CARDS_PER_PAGE = 20
+
+def _rng(key: str) -> random.Random:
+    return random.Random(zlib.crc32(key.encode("utf-8")))
+
+def _posting(key: str, query: str) -> tuple[str, str, str]:
+    rng = _rng(key)
+    term = query.replace("-", " ").title()
+    title = f"{rng.choice(TITLES).format(q=term)} {rng.choice(LEVELS)}".strip()
+    company = f"Empresa {rng.randint(1, 500)}"
+    words = [rng.choice(WORDS) for _ in range(rng.randint(120, 400))]
+    for _ in range(rng.randint(0, 4)):
+        words.insert(rng.randrange(len(words)), query.replace("-", " "))
+    return title, company, " ".join(words)
+
+def _page_shell(body: str) -> str:
+    scripts = "".join(f"<script>var tracking{i} = {'x' * 400!r};</script>" for i in range(10))
+    nav = "".join(f'<li><a href="/link-{i}">Link {i}</a></li>' for i in range(60))
+    return f"<html><head><title>Jobs</title>{scripts}</head><body><header><ul>{nav}</ul></header>{body}<footer>{nav}</footer></body></html>"
+
+def programathor_listing(query: str, page: int, pages: int) -> str:
+    if page > pages:
+        return _page_shell("")
+    cards = []
+    for i in range(CARDS_PER_PAGE):
+        slug = f"{page}-{i}--{query}"
+        title, company, _ = _posting(f"programathor/jobs/{slug}", query)
+        remote = "Remoto" if _rng(slug).random() < 0.7 else "São Paulo"
+        cards.append(
+            f'<div class="cell-list"><a href="/jobs/{slug}">'
+            f'<div class="cell-list-content"><h3>{title}</h3><div class="cell-list-content-icon">'
+            f"<span>{company}</span><span>{remote}</span></div></div></a></div>"
+        )
+    return _page_shell("".join(cards))
+
+def weworkremotely_listing(query: str, page: int, pages: int) -> str:
+    if page > pages:
+        return _page_shell('<section class="jobs"><ul></ul></section>')
+    items = []
+    for i in range(CARDS_PER_PAGE):
+        slug = f"{page}-{i}--{query}"
+        title, company, _ = _posting(f"weworkremotely/remote-jobs/{slug}", query)
+        items.append(
+            f'<li class="feature"><a href="/remote-jobs/{slug}"><span class="company">{company}</span>'
+            f'<span class="title">{title}</span></a></li>'
+        )
+    return _page_shell(f'<section class="jobs"><ul>{"".join(items)}</ul></section>')
+
+def remoteok_listing(query: str, offset: int, pages: int) -> str:
+    if offset >= pages * CARDS_PER_PAGE:
+        return _page_shell("<table></table>")
+    rows = []
+    for i in range(CARDS_PER_PAGE):
+        slug = f"{offset + i}--{query}"
+        title, company, _ = _posting(f"remoteok/remote-jobs/{slug}", query)
+        rows.append(f'<tr class="job" data-href="/remote-jobs/{slug}"><td><h2>{title}</h2><h3>{company}</h3></td></tr>')
+    return _page_shell(f"<table>{''.join(rows)}</table>")
+
+_DETAIL_CONTAINERS = {
+    "programathor": '<div class="line-height-2-4">{}</div>',
+    "weworkremotely": '<div class="listing-container">{}</div>',
+    "remoteok": '<div class="description">{}</div>',
+}
+
+def detail_page(source: str, path: str, query: str) -> str:
+    """Detail page whose description belongs to the card linking to `path`."""
+    _, _, description = _posting(f"{source}{path}", query)
+    paragraphs = "".join(f"<p>{description[i:i + 300]}</p>" for i in range(0, len(description), 300))
+    return _page_shell(_DETAIL_CONTAINERS[source].format(paragraphs))
+
+@dataclass
+class StandInBoards:
+    """Serve the three job boards from memory with injected latency and failures."""
+    latency: float = 0.05
+    jitter: float = 0.02
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    pages: int = 3
+    recorded: Path | None = None
+    seed: int = 0
+    counters: dict = field(default_factory=lambda: {"requests": 0, "errors": 0, "timeouts": 0, "bytes": 0})
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def _recorded(self, source: str, kind: str) -> str | None:
+        if self.recorded is None:
+            return None
+        path = self.recorded / f"{source}_{kind}.html"
+        return path.read_text(errors="replace") if path.exists() else None
+
+    def _listing(self, source: str, query: str, page: int) -> str:
+        recorded = self._recorded(source, "listing")
+        if recorded is not None:
+            return recorded if page <= 1 else _page_shell("")
+        if source == "programathor":
+            return programathor_listing(query, page, self.pages)
+        if source == "weworkremotely":
+            return weworkremotely_listing(query, page, self.pages)
+        return remoteok_listing(query, page, self.pages)
+
+    def render(self, request: httpx.Request) -> str:
+        host, path, params = request.url.host, request.url.path, request.url.params
+        source = {"programathor.com.br": "programathor", "weworkremotely.com": "weworkremotely", "remoteok.com": "remoteok"}.get(host)
+        if source is None:
+            raise httpx.ConnectError(f"stand-in does not serve {host}", request=request)
+        if source == "programathor" and path.startswith("/jobs-"):
+            return self._listing(source, path[len("/jobs-"):], int(params.get("page", 1)))
+        if source == "weworkremotely" and path == "/remote-jobs/search":
+            return self._listing(source, params.get("term", ""), int(params.get("page", 1)))
+        listing = re.fullmatch(r"/remote-(.+)-jobs", path)
+        if source == "remoteok" and listing:
+            return self._listing(source, listing.group(1), int(params.get("offset", 0)))
+        recorded = self._recorded(source, "detail")
+        if recorded is not None:
+            return recorded
+        return detail_page(source, path, path.rsplit("--", 1)[-1])
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.counters["requests"] += 1
+        await asyncio.sleep(max(0.0, self._random.gauss(self.latency, self.jitter)))
+        roll = self._random.random()
+        if roll < self.timeout_rate:
+            self.counters["timeouts"] += 1
+            raise httpx.ReadTimeout("injected timeout", request=request)
+        if roll < self.timeout_rate + self.error_rate:
+            self.counters["errors"] += 1
+            return httpx.Response(503, text="Service Unavailable", request=request)
+        body = self.render(request).encode("utf-8")
+        self.counters["bytes"] += len(body)
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=body, request=request)
+
+_JOB_MARKER = re.compile(r"^\s*Vaga (\d+):", re.MULTILINE)
+
+class FakeGenai:
+    """Drop-in for ``genai.Client`` exposing ``aio.models.generate_content``."""
+
+    def __init__(self, latency: float = 0.8, jitter: float = 0.2, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.counters = {"calls": 0, "batch_calls": 0, "jobs": 0, "prompt_tokens": 0}
+        self._random = random.Random(seed)
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self.generate_content))
+
+    async def generate_content(self, model: str, contents: str):
+        self.counters["calls"] += 1
+        self.counters["prompt_tokens"] += len(contents) // 4
+        await asyncio.sleep(max(0.0, self._random.gauss(self.latency, self.jitter)))
+        ids = [int(n) for n in _JOB_MARKER.findall(contents)]
+        if ids:
+            self.counters["batch_calls"] += 1
+            self.counters["jobs"] += len(ids)
+            text = json.dumps([{"id": i, "score": self._random.randint(0, 100), "reason": "benchmark"} for i in ids])
+        else:
+            self.counters["jobs"] += 1
+            text = json.dumps({"score": self._random.randint(0, 100), "reason": "benchmark"})
+        return SimpleNamespace(text=text)
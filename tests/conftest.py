@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before any app module is imported.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='vagahunter-test-')}/test.db")
+os.environ.setdefault("HTTP_CACHE_ENABLED", "false")
+os.environ.setdefault("VECTOR_INDEX_PATH", "")
@@ -0,0 +1,33 @@
+import random
+from app.services.dedupe import NearDuplicateIndex, fingerprint, same_posting
+
+_WORDS = (
+    "python django fastapi postgres docker kubernetes aws kafka api rest testes equipe produto dados "
+    "clientes sistemas benefícios remoto flexível plano saúde vale refeição home office"
+).split()
+# A company's shared job-description boilerplate, long enough to dominate the fingerprint.
+BOILERPLATE = " ".join(random.Random(0).choice(_WORDS) for _ in range(300))
+
+def test_seniority_variants_with_shared_description_are_not_linked():
+    senior = fingerprint("Senior Python Developer", "Acme", BOILERPLATE)
+    junior = fingerprint("Junior Python Developer", "Acme", BOILERPLATE)
+    index = NearDuplicateIndex(max_distance=3)
+    index.add(1, senior)
+
+    # The fingerprints alone cannot tell the two openings apart...
+    assert index.find(junior) == 1
+    # ...so the title check has to.
+    assert not same_posting("Junior Python Developer", "Acme", "Senior Python Developer", "Acme")
+
+def test_mirrored_posting_is_linked():
+    assert same_posting("🌐 Senior Python Developer", "Acme", "Senior Python Developer", "ACME")
+
+def test_different_company_is_not_linked():
+    assert not same_posting("Senior Python Developer", "Acme", "Senior Python Developer", "Globex")
+
+def test_candidates_are_sorted_by_distance():
+    index = NearDuplicateIndex(max_distance=3)
+    index.add("far", 0b111)
+    index.add("near", 0b1)
+    index.add("out", 0b1111)
+    assert index.candidates(0) == ["near", "far"]
@@ -0,0 +1,36 @@
+from datetime import timedelta, timezone
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.database import SessionLocal, init_db
+from app.models import job as models
+from app.routers import jobs
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(jobs.router)
+    return TestClient(app)
+
+def test_since_and_until_include_a_job_created_exactly_at_the_boundary():
+    init_db()
+    db = SessionLocal()
+    try:
+        job = models.Job(title="Python Developer", company="Acme", source="boundary", is_remote=True, url="https://example.com/boundary")
+        db.add(job)
+        db.commit()
+        created_at = job.created_at.replace(tzinfo=timezone.utc)
+    finally:
+        db.close()
+    client = _client()
+
+    def urls(**params) -> list[str]:
+        response = client.get("/jobs", params={"source": "boundary", **{k: v.isoformat() for k, v in params.items()}})
+        assert response.status_code == 200
+        return [job["url"] for job in response.json()]
+
+    assert urls(since=created_at) == ["https://example.com/boundary"]
+    assert urls(until=created_at) == []
+    assert urls(until=created_at + timedelta(seconds=1)) == ["https://example.com/boundary"]
+    # The same instant with an offset is converted to UTC, not compared as local time.
+    sao_paulo = created_at.astimezone(timezone(timedelta(hours=-3)))
+    assert urls(since=sao_paulo) == ["https://example.com/boundary"]
+    assert urls(since=sao_paulo + timedelta(seconds=1)) == []
@@ -0,0 +1,23 @@
+from app.database import SessionLocal, init_db
+from app.models import job as models
+from app.services.url_index import KnownUrlIndex
+
+def test_refresh_picks_up_alias_stored_right_after_the_last_refresh():
+    init_db()
+    db = SessionLocal()
+    try:
+        job = models.Job(title="Python Developer", company="Acme", source="test", is_remote=True, url="https://example.com/jobs/1")
+        db.add(job)
+        db.commit()
+        index = KnownUrlIndex(SessionLocal)
+        index.warm()
+
+        # Same second as the warm-up: a timestamp watermark would miss it.
+        db.add(models.JobAlias(url="https://example.com/jobs/1-repost", job_id=job.id))
+        db.commit()
+
+        assert index.refresh(db) == 1
+        assert "https://example.com/jobs/1-repost" in index.bloom
+        assert index.refresh(db) == 0
+    finally:
+        db.close()